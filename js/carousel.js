@@ -10,7 +10,8 @@
     let uniqueCount = 0;
     const existingItems = carouselTrack.querySelectorAll('.carousel-item');
     if (existingItems.length > 0) {
-        uniqueCount = Math.floor(existingItems.length / 3);
+        // scripts/build.py renders each highlighted item once; the loop copies are cloned below.
+        uniqueCount = existingItems.length;
     } else {
         if (typeof window.markdownLoader === 'undefined') {
             console.error('markdown-loader.js must be loaded before carousel.js');
@@ -71,11 +72,28 @@
             `;
         }
 
-        // "Infinite" scroll:
-        // Render 3 copies, start in the middle, and when the user scrolls close to the
-        // edges, jump scrollLeft by one full set width back into the middle copy.
-        const baseItemsHTML = highlightedProjects.map(project => createCarouselItem(project)).join('');
-        carouselTrack.innerHTML = baseItemsHTML + baseItemsHTML + baseItemsHTML;
+        carouselTrack.innerHTML = highlightedProjects.map(project => createCarouselItem(project)).join('');
+    }
+
+    // "Infinite" scroll:
+    // Show 3 copies of the set, start in the middle, and when the user scrolls close to the
+    // edges, jump scrollLeft by one full set width back into the middle copy.
+    // The outer copies are DOM clones of the real items: same src/srcset, so the browser
+    // reuses the already requested and decoded images instead of fetching them again.
+    if (uniqueCount > 0) {
+        const originals = Array.from(carouselTrack.querySelectorAll('.carousel-item'));
+        const cloneSet = () => {
+            const fragment = document.createDocumentFragment();
+            originals.forEach((item) => {
+                const clone = item.cloneNode(true);
+                clone.setAttribute('aria-hidden', 'true');
+                clone.setAttribute('data-carousel-clone', '');
+                fragment.appendChild(clone);
+            });
+            return fragment;
+        };
+        carouselTrack.insertBefore(cloneSet(), carouselTrack.firstChild);
+        carouselTrack.appendChild(cloneSet());
     }
 
     // Setup click handlers for navigation
@@ -85,7 +103,10 @@
         const slug = item.getAttribute('data-project-slug');
         const category = item.getAttribute('data-project-category');
         if (slug && category) {
-            window.location.href = `${category}.html#${slug}`;
+            // scripts/build.py also writes a pre-rendered page per project; without a build only the grid pages exist.
+            window.location.href = existingItems.length > 0
+                ? `content/${category}/${encodeURIComponent(slug)}/`
+                : `${category}.html#${slug}`;
         }
     });
 
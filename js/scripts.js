@@ -20,9 +20,30 @@
         return window.projectBasePath || 'content';
     }
 
+    /**
+     * On a page scripts/build.py pre-rendered for one project (content/<category>/<slug>/index.html),
+     * that project's slug: it is open when the URL has no hash. Empty on the grid pages.
+     */
+    function getProjectPageSlug() {
+        const projectDetail = getProjectDetailEl();
+        return (projectDetail && projectDetail.dataset.projectPage) || '';
+    }
+
     /** Max height used by CSS for project-detail images (100vh - 200px). */
     const PROJECT_DETAIL_MAX_IMAGE_HEIGHT_PX = 200;
 
+    /**
+     * Intrinsic size of an image or video. Images carry build-time width/height
+     * attributes, so their size is known before the file has loaded.
+     */
+    function mediaSize(el) {
+        if (el.tagName === 'VIDEO') return [el.videoWidth, el.videoHeight];
+        return [
+            el.naturalWidth || Number(el.getAttribute('width')) || 0,
+            el.naturalHeight || Number(el.getAttribute('height')) || 0,
+        ];
+    }
+
     /**
      * In project detail, make all vertical (portrait) single images and videos
      * use the same width: the minimum of their would-be rendered widths when
@@ -41,8 +62,7 @@
 
         singleMedia.forEach((el) => {
             if (el.closest('.image-pair')) return;
-            const w = el.tagName === 'VIDEO' ? el.videoWidth : el.naturalWidth;
-            const h = el.tagName === 'VIDEO' ? el.videoHeight : el.naturalHeight;
+            const [w, h] = mediaSize(el);
             if (!w || !h || h <= w) return;
             verticalMedia.push(el);
             const widthAtMaxHeight = (w / h) * maxHeightPx;
@@ -53,8 +73,7 @@
 
         singleMedia.forEach((el) => {
             if (el.closest('.image-pair')) return;
-            const w = el.tagName === 'VIDEO' ? el.videoWidth : el.naturalWidth;
-            const h = el.tagName === 'VIDEO' ? el.videoHeight : el.naturalHeight;
+            const [w, h] = mediaSize(el);
             if (!w || !h || h <= w) {
                 el.style.width = '';
                 return;
@@ -77,6 +96,148 @@
         }
     }
     
+    /**
+     * Fetch the detail view pre-rendered by scripts/build.py (content/<category>/<slug>/detail.html).
+     * Returns null if it is missing, so callers can fall back to parsing the markdown.
+     */
+    async function loadDetailFragment(slug) {
+        try {
+            const response = await fetch(`${getBasePath()}/${encodeURIComponent(slug)}/detail.html`);
+            return response.ok ? await response.text() : null;
+        } catch {
+            return null;
+        }
+    }
+
+    /**
+     * Decode the compact index scripts/build.py inlines into #projects-data (see project_index there):
+     * {v, n: shard size, s: string table, p: [[slug, title, year_label] as indexes into s]}.
+     * Fuller records are fetched per shard by loadProjectShard when a detail view opens.
+     */
+    function readProjectIndex(data, category) {
+        if (Array.isArray(data)) return data;
+        const strings = data.s || [];
+        return (data.p || []).map(([slug, title, yearLabel], i) => ({
+            id: strings[slug],
+            slug: strings[slug],
+            path: strings[slug],
+            category,
+            title: strings[title],
+            year_label: strings[yearLabel],
+            shard: Math.floor(i / (data.n || 1)),
+        }));
+    }
+
+    const projectShardRequests = {};
+
+    /** Fetch content/<category>/projects-<n>.json once and merge its records into window.currentProjects. */
+    function loadProjectShard(shard) {
+        if (shard == null) return Promise.resolve();
+        if (!projectShardRequests[shard]) {
+            projectShardRequests[shard] = fetch(`${getBasePath()}/projects-${shard}.json`)
+                .then((response) => (response.ok ? response.json() : []))
+                .then((records) => {
+                    records.forEach((record) => {
+                        const project = findProjectBySlug(record.slug);
+                        if (project) Object.assign(project, record);
+                    });
+                })
+                .catch(() => {
+                    delete projectShardRequests[shard];
+                });
+        }
+        return projectShardRequests[shard];
+    }
+
+    const SEARCH_BASE = 'content/search';
+    const searchRequests = {};
+
+    function fetchSearchFile(name) {
+        if (!searchRequests[name]) {
+            searchRequests[name] = fetch(`${SEARCH_BASE}/${name}`)
+                .then((response) => (response.ok ? response.json() : null))
+                .catch(() => {
+                    delete searchRequests[name];
+                    return null;
+                });
+        }
+        return searchRequests[name];
+    }
+
+    /** Same tokenization as search_tokens in scripts/build.py. */
+    function searchTokens(text, stopwords) {
+        const folded = text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '');
+        return (folded.match(/[\p{L}\p{N}]+/gu) || []).filter((t) => t.length > 1 && !stopwords.has(t));
+    }
+
+    function lowerBound(sorted, value) {
+        let lo = 0;
+        let hi = sorted.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (sorted[mid] < value) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+
+    /** Shard key of a query word, as search_shard_key in scripts/build.py (at its longest prefix). */
+    function searchShardKey(token) {
+        return Array.from(token).slice(0, 3).map((c) => (/[a-z0-9]/.test(c) ? c : '_')).join('');
+    }
+
+    /**
+     * Search projects, publications and talks with the index scripts/build.py writes to content/search/
+     * (see search_index there). Every query word must be a prefix of an indexed term; title and exact
+     * matches rank higher. Only index.json, the term shards covering the words' prefixes and the doc
+     * shards holding the results are fetched, each once, so a query costs a few KB.
+     * Resolves to [{type, title, url, subtitle}], best first.
+     */
+    async function searchSite(query, limit = 20) {
+        const index = await fetchSearchFile('index.json');
+        if (!index) return [];
+        index.stopwords = index.stopwords || new Set(index.stop);
+        const tokens = [...new Set(searchTokens(query, index.stopwords))];
+        if (!tokens.length) return [];
+        const shards = await Promise.all(tokens.map((token) => {
+            const key = searchShardKey(token);
+            const keys = index.shards.filter((k) => k.startsWith(key) || key.startsWith(k));
+            return Promise.all(keys.map((k) => fetchSearchFile(`terms-${k}.json`)));
+        }));
+        let scores = null;
+        tokens.forEach((token, i) => {
+            const matches = new Map();
+            shards[i].forEach((shard) => {
+                if (!shard) return;
+                for (let j = lowerBound(shard.t, token); j < shard.t.length && shard.t[j].startsWith(token); j++) {
+                    const exact = shard.t[j] === token ? 1 : 0;
+                    let posting = 0;
+                    shard.p[j].forEach((gap) => {
+                        posting += gap;
+                        const doc = posting >> 1;
+                        const score = 1 + exact + (posting & 1) * 2;
+                        matches.set(doc, Math.max(matches.get(doc) || 0, score));
+                    });
+                }
+            });
+            if (scores === null) {
+                scores = matches;
+                return;
+            }
+            const both = new Map();
+            matches.forEach((score, doc) => {
+                if (scores.has(doc)) both.set(doc, scores.get(doc) + score);
+            });
+            scores = both;
+        });
+        const best = [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, limit);
+        const docShards = await Promise.all(best.map(([doc]) => fetchSearchFile(`docs-${Math.floor(doc / index.per)}.json`)));
+        return best
+            .map(([doc], i) => docShards[i] && docShards[i].d[doc % index.per])
+            .filter(Boolean)
+            .map(([type, title, url, subtitle]) => ({ type, title, url, subtitle }));
+    }
+
     function findProjectBySlug(slug) {
         if (!slug || !Array.isArray(window.currentProjects)) return null;
         return window.currentProjects.find((p) => String(p.slug || p.id) === String(slug)) || null;
@@ -120,12 +281,12 @@
         const projectDetail = getProjectDetailEl();
         const basePath = getBasePath();
         
-        if (!projectDetail || !window.markdownLoader) {
+        if (!projectDetail || (!project.detail_html && !window.markdownLoader)) {
             console.error('Project detail element or markdown loader not found');
             return;
         }
         
-        const detailHTML = window.markdownLoader.renderProjectDetail(project, basePath);
+        const detailHTML = project.detail_html || window.markdownLoader.renderProjectDetail(project, basePath);
         projectDetail.innerHTML = detailHTML;
         
         if (skipAnimation) {
@@ -159,6 +320,11 @@
             document.body.appendChild(script);
         }
 
+        attachProjectDetailHandlers(projectDetail);
+    }
+
+    /** Image effects and uniform image widths for the detail currently in #project-detail. */
+    function attachProjectDetailHandlers(projectDetail) {
         // Recheck images in view after rendering
         if (typeof window.requestAnimationFrame === 'function') {
             setTimeout(() => {
@@ -221,12 +387,22 @@
         ensureProjectHistoryInitialized();
         if (!getProjectDetailEl()) return;
 
-        const slug = getSlugFromHash();
+        const projectDetail = getProjectDetailEl();
+        const slug = getSlugFromHash() || getProjectPageSlug();
         if (!slug) {
             closeProjectDetailUI();
             return;
         }
 
+        // A pre-rendered project page arrives with its detail (and custom JS) in place: only attach the handlers.
+        if (projectDetail.hasAttribute('data-prerendered') && slug === getProjectPageSlug()) {
+            projectDetail.removeAttribute('data-prerendered');
+            setActiveTile(slug);
+            attachProjectDetailHandlers(projectDetail);
+            return;
+        }
+        projectDetail.removeAttribute('data-prerendered');
+
         if (!Array.isArray(window.currentProjects)) {
             return;
         }
@@ -239,9 +415,18 @@
             return;
         }
 
-        if (!project.body && window.markdownLoader && typeof window.markdownLoader.loadSingleProject === 'function') {
-            const basePath = getBasePath();
-            const full = await window.markdownLoader.loadSingleProject(basePath, project.slug || project.id);
+        if (!project.body && !project.detail_html) {
+            let full = null;
+            const [fragment] = await Promise.all([
+                loadDetailFragment(project.slug || project.id),
+                loadProjectShard(project.shard),
+            ]);
+            project = findProjectBySlug(slug) || project;
+            if (fragment) {
+                full = { ...project, detail_html: fragment };
+            } else if (window.markdownLoader && typeof window.markdownLoader.loadSingleProject === 'function') {
+                full = await window.markdownLoader.loadSingleProject(getBasePath(), project.slug || project.id);
+            }
             if (full) {
                 const idx = window.currentProjects.findIndex(p => (p.slug || p.id) === slug);
                 if (idx >= 0) window.currentProjects[idx] = full;
@@ -280,6 +465,8 @@
     
     // Public API used by HTML templates (e.g. close button) and page scripts.
     window.syncProjectDetailToUrl = syncProjectDetailToUrl;
+    window.readProjectIndex = readProjectIndex;
+    window.searchSite = searchSite;
     window.openProjectBySlug = openProjectBySlug;
     
     // Backward compatibility (some pages call showProjectDetail(project, skipAnimation))
@@ -297,17 +484,26 @@
             return;
         }
         
+        // A pre-rendered project page closes to its grid page.
+        const gridPage = getProjectDetailEl()?.dataset.gridPage;
+        if (gridPage) {
+            window.location.href = gridPage;
+            return;
+        }
+
         // Fallback (should be rare): just close UI.
         closeProjectDetailUI();
     };
     
     document.addEventListener('DOMContentLoaded', () => {
     // Set active navigation link based on current page
-    const currentPage = window.location.pathname.split('/').pop() || 'index.html';
+    // Pre-rendered project pages (content/<category>/<slug>/) count as their grid page.
+    const gridPage = document.getElementById('project-detail')?.dataset.gridPage;
+    const currentPage = gridPage || window.location.pathname.split('/').pop() || 'index.html';
     const navLinks = document.querySelectorAll('.header-nav a');
     
     // Check if we're on the home page
-    if (currentPage === 'index.html' || currentPage === '' || currentPage === 'website/index.html' || window.location.pathname.endsWith('/')) {
+    if (!gridPage && (currentPage === 'index.html' || currentPage === '' || currentPage === 'website/index.html' || window.location.pathname.endsWith('/'))) {
         document.body.classList.add('is-home-page');
     }
     
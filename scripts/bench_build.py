@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Benchmark the build pipeline (scripts/build.py) on synthetic content.
+
+Generates a throwaway repo per scale (N art + N research projects, M publications each,
+long talks/media lists, matching projects.json, copies of the four page templates), times
+the parsers, load_projects, each build_* function and whole BuildSession builds (full, no-op,
+one project or talks.md edited), and stores the results as JSON so runs can be compared
+across commits:
+
+    python3 scripts/bench_build.py --scales 1000 10000
+    python3 scripts/bench_build.py --compare .cache/bench/old.json .cache/bench/new.json
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+import build
+
+PAGES = build.PAGES
+WORDS = (
+    "robot hand soft grasp tactile sensing learning compliance vision event camera light "
+    "facade monolith sacred architecture sound synthesis installation gallery exhibition"
+).split()
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parent.parent
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+
+def project_markdown(rng: random.Random, slug: str, category: str, publications: int) -> str:
+    start = rng.randint(2010, 2024)
+    lines = [
+        "---",
+        f"title: {sentence(rng, 3)}",
+        f"date_start: {start}-{rng.randint(1, 12):02d}-01",
+        f"date_end: {start + rng.randint(0, 2)}-{rng.randint(1, 12):02d}-15",
+        f"short_description: {sentence(rng, 12)}.",
+        "cover_image: media/cover.jpg",
+        f"highlight: {'true' if rng.random() < 0.02 else 'false'}",
+        "collaborators:",
+    ]
+    for _ in range(3):
+        lines += [f'  - name: "{sentence(rng, 2)}"', f'    url: "https://example.com/{rng.randint(0, 10**6)}"']
+    lines += ["resources:", '  - label: "Code"', f'    url: "https://github.com/example/{slug}"']
+    if category == "research" and publications:
+        lines.append("publications:")
+        for _ in range(publications):
+            authors = ", ".join(f'"{sentence(rng, 2)}"' for _ in range(rng.randint(1, 5)))
+            lines += [
+                f"  - authors: [{authors}]",
+                f"    year: {rng.randint(2015, 2026)}",
+                f'    title: "{sentence(rng, 8)}"',
+                f'    venue: "[{sentence(rng, 4)}](https://example.com/venue) at {sentence(rng, 5)}"',
+                f"    show_on_about: {'false' if rng.random() < 0.3 else 'true'}",
+                "    resources:",
+                '      - label: "Paper"',
+                f'        url: "https://arxiv.org/abs/{rng.randint(1000, 9999)}.{rng.randint(10000, 99999)}"',
+                '      - label: "Poster"',
+                '        url: "media/poster.pdf"',
+            ]
+    lines.append("---")
+    body = [
+        "",
+        f"{sentence(rng, 40)} [{sentence(rng, 2)}](https://example.com) {sentence(rng, 20)}.",
+        "",
+        f"![{sentence(rng, 3)}](media/a.jpg)",
+        f"![{sentence(rng, 3)}](media/b.jpg)",
+        "",
+        f"**{sentence(rng, 2)}** and *{sentence(rng, 2)}*: {sentence(rng, 30)}.",
+        "",
+        f"> {sentence(rng, 25)}",
+        ">",
+        f"> {sentence(rng, 25)}",
+        "",
+        f"- {sentence(rng, 5)}",
+        f"- {sentence(rng, 5)}",
+        "",
+    ]
+    return "\n".join(lines + body)
+
+
+def about_list_markdown(rng: random.Random, key: str, count: int) -> str:
+    lines = ["---", f"{key}:"]
+    for i in range(count):
+        if key == "talks":
+            lines += [
+                f'  - title: "{sentence(rng, 6)}"',
+                f'    venue: "{sentence(rng, 3)}"',
+                f'    venue_url: "https://example.com/{i}"',
+                f'    year: "{rng.randint(2015, 2026)}"',
+            ]
+        else:
+            lines += [
+                f'  - description: "Interview {sentence(rng, 6)}"',
+                f'    outlet_name: "{sentence(rng, 2)}"',
+                f'    outlet_url: "https://example.com/{i}"',
+                f'    date: "June {rng.randint(1, 28)}, {rng.randint(2015, 2026)}"',
+            ]
+        lines += ["    resources:", '      - label: "Link"', f'        url: "https://example.com/r/{i}"']
+    return "\n".join(lines + ["---", ""])
+
+
+def generate_repo(dest: Path, projects: int, publications: int, about_items: int, seed: int) -> dict[str, list[str]]:
+    """Write a synthetic repo (content/ + page templates) with `projects` projects per category."""
+    rng = random.Random(seed)
+    for page in PAGES:
+        shutil.copy(repo_root() / page, dest / page)
+    (dest / build.PROJECT_PAGE_TEMPLATE).parent.mkdir(parents=True)
+    shutil.copy(repo_root() / build.PROJECT_PAGE_TEMPLATE, dest / build.PROJECT_PAGE_TEMPLATE)
+    content = dest / "content"
+    config: dict[str, list[str]] = {}
+    for category in ("art", "research"):
+        slugs = [f"{category}-{i:06d}" for i in range(projects)]
+        config[category] = slugs
+        for slug in slugs:
+            folder = content / category / slug
+            folder.mkdir(parents=True)
+            (folder / "index.md").write_text(project_markdown(rng, slug, category, publications), encoding="utf-8")
+    about = content / "about"
+    about.mkdir(parents=True)
+    (about / "bio.md").write_text(f"# About\n\n## Bio\n\n{sentence(rng, 60)}\n\n{sentence(rng, 60)}\n", encoding="utf-8")
+    (about / "talks.md").write_text(about_list_markdown(rng, "talks", about_items), encoding="utf-8")
+    (about / "media.md").write_text(about_list_markdown(rng, "media", about_items), encoding="utf-8")
+    (content / "projects.json").write_text(json.dumps(config), encoding="utf-8")
+    return config
+
+
+def load_build_copy(dest: Path) -> ModuleType:
+    """build.py (and minify.py) copied into the synthetic repo and imported from there.
+
+    BuildSession lists its own build.py among the inputs, so it has to live inside the repo it builds.
+    """
+    for name in ("build.py", "minify.py"):
+        shutil.copy(repo_root() / "scripts" / name, dest / "scripts" / name)
+    spec = importlib.util.spec_from_file_location(f"build_{dest.name.replace('-', '_')}", dest / "scripts" / "build.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses look their module up while the class is created
+    spec.loader.exec_module(module)
+    return module
+
+
+def edited(path: Path, n: Iterator[int]) -> Callable[[], None]:
+    """A function that appends a new line to path on every call, so each timed build has one fresh edit."""
+    original = path.read_text(encoding="utf-8")
+    return lambda: path.write_text(f"{original}\n<!-- edit {next(n)} -->\n", encoding="utf-8")
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_scale(projects: int, publications: int, about_items: int, repeat: int, seed: int, keep: bool) -> dict[str, float]:
+    tmp = Path(tempfile.mkdtemp(prefix=f"bench-build-{projects}-"))
+    try:
+        print(f"[{projects}] generating synthetic content in {tmp} ...")
+        config = generate_repo(tmp, projects, publications, about_items, seed)
+        content = tmp / "content"
+        raws = [
+            (content / c / slug / "index.md").read_text(encoding="utf-8") for c in ("art", "research") for slug in config[c]
+        ]
+        research_fms = [build.split_frontmatter(raw) or "" for raw in raws[projects:]]
+        talks_fm = build.split_frontmatter((content / "about" / "talks.md").read_text(encoding="utf-8")) or ""
+        media_fm = build.split_frontmatter((content / "about" / "media.md").read_text(encoding="utf-8")) or ""
+
+        def fresh_store() -> build.ContentStore:
+            return build.ContentStore(content, config["art"], config["research"])
+
+        def details() -> None:
+            store = fresh_store()
+            for c in ("art", "research"):
+                for slug in config[c]:
+                    build.build_detail(tmp, store, build.detail_output(c, slug))
+
+        def project_pages() -> None:
+            store = fresh_store()
+            for c in ("art", "research"):
+                for slug in config[c]:
+                    build.build_project_page(tmp, store, build.project_page_output(c, slug))
+
+        session_build = load_build_copy(tmp)
+        counter = itertools.count()
+        edit_project = edited(content / "art" / config["art"][len(config["art"]) // 2] / "index.md", counter)
+        edit_talks = edited(content / "about" / "talks.md", counter)
+
+        def session(edit: Callable[[], None] | None = None, force: bool = False) -> Callable[[], None]:
+            """A build as `python3 scripts/build.py` runs it: fresh session, state and caches read from disk."""
+            def run() -> None:
+                if edit:
+                    edit()
+                session_build.BuildSession(tmp).build(force)
+            return run
+
+        paths = [(content / c / slug / "index.md", slug, c) for c in ("art", "research") for slug in config[c]]
+        benches: dict[str, Callable[[], Any]] = {
+            "parse_project_file": lambda: [build.parse_project_file(*args) for args in paths],
+            "parse_frontmatter": lambda: [build.parse_frontmatter(raw) for raw in raws],
+            "extract_publications_from_frontmatter": lambda: [
+                build.extract_publications_from_frontmatter(fm) for fm in research_fms
+            ],
+            "_parse_list_from_frontmatter": lambda: (
+                build._parse_list_from_frontmatter(talks_fm, "talks"),
+                build._parse_list_from_frontmatter(media_fm, "media"),
+            ),
+            "load_projects": lambda: [build.load_projects(content, c, config[c], c) for c in ("art", "research")],
+            "build_index": lambda: build.build_index(tmp, fresh_store()),
+            "build_art": lambda: build.build_art(tmp, fresh_store()),
+            "build_research": lambda: build.build_research(tmp, fresh_store()),
+            "build_about": lambda: build.build_about(tmp, fresh_store()),
+            "build_detail (all)": details,
+            "build_project_page (all)": project_pages,
+            "build_search": lambda: build.build_search(tmp, fresh_store()),
+            "build_sitemap": lambda: build.build_sitemap(tmp, fresh_store()),
+            "BuildSession.build (force)": session(force=True),
+            "BuildSession.build (no-op)": session(),
+            "BuildSession.build (one project edited)": session(edit_project),
+            "BuildSession.build (talks.md edited)": session(edit_talks),
+        }
+        results = {}
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            results["BuildSession.build (full)"] = timed(session(), 1)  # also the starting point of the ones below
+        print(f"[{projects}] {'BuildSession.build (full)':<40} {results['BuildSession.build (full)'] * 1e3:10.1f} ms")
+        for name, func in benches.items():
+            # Builders print progress; keep the benchmark table readable.
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                results[name] = timed(func, repeat)
+            print(f"[{projects}] {name:<40} {results[name] * 1e3:10.1f} ms")
+        return results
+    finally:
+        if keep:
+            print(f"[{projects}] kept {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=repo_root(), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_path: Path, new_path: Path) -> None:
+    old = json.loads(old_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for scale, results in new["results"].items():
+        before = old["results"].get(scale, {})
+        print(f"scale {scale}:")
+        for name, seconds in results.items():
+            if name in before and before[name] > 0:
+                print(f"  {name:<40} {before[name] * 1e3:10.1f} -> {seconds * 1e3:10.1f} ms  ({seconds / before[name]:5.2f}x)")
+            else:
+                print(f"  {name:<40} {'-':>10} -> {seconds * 1e3:10.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scripts/build.py on synthetic content.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000], help="Projects per category (default: 1000).")
+    parser.add_argument("--publications", type=int, default=3, help="Publications per research project (default: 3).")
+    parser.add_argument("--about-items", type=int, default=200, help="Entries in talks.md and media.md (default: 200).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is kept (default: 3).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None, help="Results JSON (default: .cache/bench/bench-<commit>.json).")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated repos.")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"), help="Compare two results files.")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    commit = git_commit()
+    report: dict[str, Any] = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {"publications": args.publications, "about_items": args.about_items, "repeat": args.repeat},
+        "results": {},
+    }
+    for scale in args.scales:
+        report["results"][str(scale)] = run_scale(
+            scale, args.publications, args.about_items, args.repeat, args.seed, args.keep
+        )
+    out = args.out or repo_root() / ".cache" / "bench" / f"bench-{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
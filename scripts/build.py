@@ -4,40 +4,350 @@ Pre-render the whole site: index carousel, art/research grids, about bio (and op
 Run after changing content; dev.py and the pre-commit hook call this script.
 """
 
+import argparse
+import cProfile
+import functools
+import gzip
+import hashlib
+import inspect
+import io
 import json
+import os
 import re
+import shutil
+import struct
+import subprocess
+import time
+import unicodedata
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+from urllib.parse import quote
+
+from minify import minify_css, minify_html, minify_js
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+PAGES = ("index.html", "art.html", "research.html", "about.html")
+DETAIL_FRAGMENT = "detail.html"
+# Standalone copy of the grid page with one project already open, so shared links render without JS.
+PROJECT_PAGE = "index.html"
+PROJECT_PAGE_TEMPLATE = Path("scripts") / "templates" / "project.html"
+SITE_URL = "https://axkoenig.com"
+SITEMAP = "sitemap.xml"
+PROJECT_SHARD = "projects-{n}.json"
+PROJECT_SHARD_SIZE = 32
+PROJECT_INDEX_VERSION = 1
+SEARCH_DIR = Path("content") / "search"
+SEARCH_INDEX = "index.json"
+SEARCH_DOCS = "docs-{n}.json"
+SEARCH_DOCS_PER_SHARD = 64
+SEARCH_SHARD = "terms-{key}.json"
+SEARCH_SHARD_BYTES = 8 * 1024  # term shards above this are split on a longer prefix...
+SEARCH_SHARD_MAX_PREFIX = 3  # ...up to this many characters
+SEARCH_INDEX_VERSION = 2
+SEARCH_STOPWORDS = ("the", "and", "of", "in", "on", "at", "to", "for", "from", "with", "by", "an", "is", "its", "via")
+SRCSET_MANIFEST = "srcset.json"  # in content/, written by scripts/responsive_images.py
+SRCSET_WIDTHS = (320, 640, 960, 1600, 2400)
+# sizes hints matching css/style.css: 300px tile column (full width below 768px), 750x600 carousel (500x400 below).
+TILE_SIZES = "(max-width: 768px) calc(100vw - 40px), 300px"
+CAROUSEL_SIZES = "(max-width: 768px) 500px, 750px"
+BUILD_STATE_PATH = Path(".cache") / "build" / "deps.json"
+BUILD_STATE_VERSION = 1
+PARSE_CACHE_PATH = Path(".cache") / "build" / "parse.json"
+PARSE_CACHE_VERSION = 1
+IMAGE_SIZES_PATH = Path(".cache") / "build" / "images.json"
+IMAGE_SIZES_VERSION = 2
+# What build.py --dist exports: the site as GitHub Pages serves it, without scripts/, README, caches or media/originals/.
+DIST_DIR = Path("dist")
+DIST_ROOT_FILES = PAGES + ("favicon.svg", "robots.txt", "sitemap.xml", "CNAME", ".nojekyll")
+DIST_DIRS = ("css", "js", "content")
+DIST_SKIP_DIRS = {"originals"}
+MINIFIERS = {".html": minify_html, ".css": minify_css, ".js": minify_js}
+# Text files in dist get .gz (and .br with the brotli module) siblings for hosts/dev.py to serve by Accept-Encoding.
+PRECOMPRESS_SUFFIXES = {".html", ".css", ".js", ".json", ".md", ".svg", ".xml", ".txt"}
+PRECOMPRESS_MIN_BYTES = 512
+# Variants that did not come out smaller than their source, so precompress does not retry them while it is unchanged.
+PRECOMPRESS_SKIPS_PATH = Path(".cache") / "build" / "precompress.json"
+PRECOMPRESS_SKIPS_VERSION = 1
+# New files of these types may be inputs (dev.py rebuilds for them); other new files only matter once a page uses them.
+WATCH_TEXT_SUFFIXES = PRECOMPRESS_SUFFIXES | {".py"}
+# css/, js/ and custom_js files also get a content-hashed copy in dist (safe to cache forever), listed here.
+ASSET_MANIFEST = "asset-manifest.json"
+ASSET_HASH_LENGTH = 10
+
+
+class Profiler:
+    """Wall/CPU time and call counts per build stage, plus Chrome trace events (build.py --profile)."""
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.stats: dict[str, list[float]] = {}
+        self.events: list[dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            calls_wall_cpu = self.stats.setdefault(name, [0, 0.0, 0.0])
+            calls_wall_cpu[0] += 1
+            calls_wall_cpu[1] += wall
+            calls_wall_cpu[2] += cpu
+            self.events.append({
+                "name": name, "ph": "X", "pid": os.getpid(), "tid": 0,
+                "ts": round((wall0 - self.t0) * 1e6, 1), "dur": round(wall * 1e6, 1),
+            })
+
+    def summary(self) -> str:
+        lines = [f"  {'wall ms':>9} {'cpu ms':>9} {'calls':>7}  stage"]
+        for name, (calls, wall, cpu) in sorted(self.stats.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {wall * 1e3:9.1f} {cpu * 1e3:9.1f} {int(calls):7d}  {name}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path) -> None:
+        """Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev)."""
+        path.write_text(json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+# Set by main() when profiling; stages are no-ops otherwise.
+PROFILER: Profiler | None = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    if PROFILER is None:
+        yield
+    else:
+        with PROFILER.stage(name):
+            yield
+
+
+def profiled(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Record every call of the decorated function as stage name while profiling."""
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if PROFILER is None:
+                return func(*args, **kwargs)
+            with PROFILER.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@profiled("write output")
+def write_output(path: Path, text: str) -> bool:
+    """Write text to path unless it already holds exactly these bytes; return whether it was written.
+
+    Goes through a temp file and os.replace, so readers (and a crashed build) never see a half-written file.
+    """
+    data = text.encode("utf-8")
+    try:
+        st = path.stat()
+        if st.st_size == len(data) and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+            return False
+    except FileNotFoundError:
+        st = None
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        if st is not None:
+            os.chmod(tmp, st.st_mode & 0o7777)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return True
+
+
+def unchanged_note(written: bool) -> str:
+    return "" if written else ", unchanged"
+
+
+FRONTMATTER_RE = re.compile(r"^---\s*\n([\s\S]*?)\n---\s*\n")
+
+
+def split_frontmatter(content: str) -> str | None:
+    """Raw frontmatter text between the leading --- fences, or None if there is none."""
+    match = FRONTMATTER_RE.match(content)
+    return match.group(1) if match else None
 
 
 def parse_frontmatter(content: str) -> dict[str, Any]:
     """Extract top-level frontmatter key: value (no nested parsing)."""
-    match = re.match(r"^---\s*\n([\s\S]*?)\n---\s*\n", content)
-    if not match:
+    fm = split_frontmatter(content)
+    if fm is None:
         return {}
-    meta: dict[str, Any] = {}
-    for line in match.group(1).split("\n"):
-        if line.startswith((" ", "\t")):
-            continue
-        stripped = line.strip()
-        if not stripped or stripped.startswith("-"):
+    return parse_frontmatter_text(fm)
+
+
+META_KEYS = (
+    "title", "cover_image", "short_description", "date_start", "date_end", "year",
+    "location", "gallery", "dimensions", "copyright", "artist", "item_name",
+    "custom_js",
+)
+
+
+def _yaml_value(s: str) -> str:
+    """Extract value from YAML-like string; handle quoted values containing colons."""
+    s = s.strip()
+    if not s:
+        return s
+    if s[0] in "\"'" and len(s) > 1:
+        end = s[0]
+        if "\\" not in s:
+            close = s.find(end, 1)
+            if close != -1:
+                return s[1:close]
+            return s.strip("\"'")
+        i = 1
+        while i < len(s):
+            if s[i] == "\\" and i + 1 < len(s):
+                i += 2
+                continue
+            if s[i] == end:
+                return s[1:i].replace("\\\"", '"').replace("\\'", "'")
+            i += 1
+    return s.strip('"\'') if s else s
+
+
+_INLINE_ITEM_RE = re.compile(r"""\s*("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^,]*?)\s*(?:,|$)""")
+
+
+def _inline_list(s: str) -> list[str]:
+    """Items of an inline list like ["A", 'B, C', D]; commas inside quotes do not split."""
+    return [_yaml_value(item) for item in _INLINE_ITEM_RE.findall(s, 1, len(s) - 1) if item]
+
+
+def _scalar(s: str) -> str | list[str]:
+    if not s:
+        return s
+    if s[0] == "[" and s[-1] == "]":
+        return _inline_list(s)
+    if s[0] in "\"'":
+        return _yaml_value(s)
+    return s
+
+
+_QUOTE_OR_LIST = "\"'["
+# One match per line: indent, optional "- ", optional "key:", rest of the line.
+_FM_LINE_RE = re.compile(r"^([ \t]*)(-(?:[ \t]+|$))?(?:([A-Za-z_][\w-]*)[ \t]*:(?:[ \t]+|$))?(.*)$", re.M)
+
+
+@profiled("parse frontmatter")
+def parse_frontmatter_tree(fm_text: str) -> dict[str, Any]:
+    """Frontmatter text as a tree of dicts, lists and strings, in one pass over the lines.
+
+    Handles the subset our content uses: key: scalar, quoted strings, inline lists,
+    nested maps and lists of maps ("- key: value" followed by keys at the same column).
+    Lines that fit nowhere are skipped rather than rejected, like the old per-key scanners.
+    """
+    root: dict[str, Any] = {}
+    # Open containers, innermost last, as (column of their keys or dashes, container).
+    stack: list[tuple[int, Any]] = []
+    top_indent, top, top_is_list = 0, root, False
+    pending: tuple[Any, str | None, int] | None = None  # "key:" (or bare "-") waiting for its nested block
+    for indent_s, dash, key, value in _FM_LINE_RE.findall(fm_text):
+        if value:
+            value = value.rstrip()
+            if not dash and not key and (not value or value[0] == "#"):
+                continue
+        elif not dash and not key:
             continue
-        if ":" not in stripped:
+        indent = len(indent_s)
+        if pending is not None:
+            parent, pkey, pindent = pending
+            pending = None
+            if indent > pindent or (dash and indent == pindent and pkey is not None):
+                child: Any = [] if dash else {}
+                if pkey is None:
+                    parent.append(child)
+                else:
+                    parent[pkey] = child
+                stack.append((top_indent, top))
+                top_indent, top, top_is_list = indent, child, bool(dash)
+            elif pkey is None:
+                parent.append("")
+            else:
+                parent[pkey] = ""
+        while stack and (top_indent > indent or (top_indent == indent and top_is_list and not dash)):
+            top_indent, top = stack.pop()
+            top_is_list = isinstance(top, list)
+        if dash:
+            if top_indent != indent or not top_is_list:
+                continue
+            if key:
+                item: dict[str, Any] = {}
+                top.append(item)
+                stack.append((top_indent, top))
+                top_indent, top, top_is_list = indent + len(dash), item, False
+            elif value:
+                top.append(value if value[0] not in _QUOTE_OR_LIST else _scalar(value))
+                continue
+            else:
+                pending = (top, None, indent)
+                continue
+        elif top_indent != indent or not key or top_is_list:
             continue
-        key, _, value = line.partition(":")
-        key = key.strip()
-        value = value.strip()
-        if key in (
-            "title", "cover_image", "short_description", "date_start", "date_end", "year",
-            "location", "gallery", "dimensions", "copyright", "artist", "item_name",
-            "custom_js",
-        ):
-            meta[key] = value.strip('"\'')
-        elif key == "highlight":
-            meta[key] = value.lower() in ("true", "yes", "1")
+        if value:
+            top[key] = value if value[0] not in _QUOTE_OR_LIST else _scalar(value)
+        else:
+            pending = (top, key, top_indent)
+    if pending is not None:
+        parent, pkey, _ = pending
+        if pkey is None:
+            parent.append("")
+        else:
+            parent[pkey] = ""
+    return root
+
+
+def frontmatter_meta(data: dict[str, Any]) -> dict[str, Any]:
+    """Whitelisted top-level scalars (plus highlight as a bool) from a frontmatter tree."""
+    meta: dict[str, Any] = {}
+    for key in META_KEYS:
+        value = data.get(key)
+        if isinstance(value, str):
+            meta[key] = value
+    highlight = data.get("highlight")
+    if isinstance(highlight, str):
+        meta["highlight"] = highlight.lower() in ("true", "yes", "1")
     return meta
 
 
+def frontmatter_list(data: dict[str, Any], list_key: str) -> list[dict[str, Any]]:
+    """A top-level list of maps (talks, media, resources, collaborators); other entries are dropped."""
+    items = data.get(list_key)
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+def frontmatter_publications(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """The publications list with show_on_about as a bool."""
+    publications = []
+    for paper in frontmatter_list(data, "publications"):
+        paper = dict(paper)
+        if "show_on_about" in paper:
+            paper["show_on_about"] = str(paper["show_on_about"]).lower() not in ("false", "no", "0")
+        publications.append(paper)
+    return publications
+
+
+def parse_frontmatter_text(fm_text: str) -> dict[str, Any]:
+    """Top-level key: value pairs of already split frontmatter text."""
+    return frontmatter_meta(parse_frontmatter_tree(fm_text))
+
+
 def year_label(meta: dict[str, Any]) -> str:
     start = meta.get("date_start") or meta.get("year") or ""
     end = meta.get("date_end") or meta.get("year") or ""
@@ -109,7 +419,38 @@ def _sort_ts(meta: dict[str, Any]) -> int:
     return 0
 
 
-def project_tile_html(project: dict[str, Any], base_path: str) -> str:
+def srcset_attrs(entry: dict[str, Any] | None, src: str, sizes: str) -> str:
+    """ srcset/sizes attributes for src (repo-relative) from its ImageIndex entry, or "" if it has no variants."""
+    if not entry or not entry.get("variants"):
+        return ""
+    folder = src.rsplit("/", 1)[0]
+    candidates = [f"{quote(f'{folder}/{name}')} {width}w" for width, name in sorted(entry["variants"].items(), key=lambda v: int(v[0]))]
+    candidates.append(f"{quote(src)} {entry['width']}w")
+    return f' srcset="{", ".join(candidates)}" sizes="{sizes}"'
+
+
+def dimension_attrs(entry: dict[str, Any] | None, style: bool = True, reserve: bool = False) -> str:
+    """ width/height (which browsers also turn into the aspect-ratio) and the placeholder background, if known,
+    so the image's box is laid out before any of its bytes arrive.
+
+    reserve adds --natural-width/--ratio for images that CSS sizes with width: auto (detail bodies), which would
+    otherwise ignore the attributes; style=False leaves out the style attribute (the tag already has one).
+    """
+    if not entry:
+        return ""
+    attrs = f' width="{entry["width"]}" height="{entry["height"]}"'
+    styles = []
+    if reserve:
+        styles.append(f"--natural-width: {entry['width']}px; --ratio: {entry['width']} / {entry['height']}")
+    if entry.get("placeholder"):
+        styles.append(f"background: {entry['placeholder']}")
+    if style and styles:
+        attrs += f' style="{"; ".join(styles)}"'
+    return attrs
+
+
+@profiled("project_tile_html")
+def project_tile_html(project: dict[str, Any], base_path: str, images: "ImageIndex | None" = None) -> str:
     cover = (project.get("cover_image") or "").strip()
     if cover and not (cover.startswith("http://") or cover.startswith("https://")):
         cover = f"{base_path}/{project['path']}/{cover}"
@@ -123,9 +464,10 @@ def project_tile_html(project: dict[str, Any], base_path: str) -> str:
     item_name = project.get("item_name") or project.get("title") or ""
     description = (project.get("short_description") or "").strip()
     title = (project.get("title") or "Untitled").replace('"', "&quot;")
+    entry = images.get(cover) if images is not None and cover else None
 
     cover_block = (
-        f'<div class="project-cover">\n                <img src="{cover}" alt="{title}" loading="lazy" />\n            </div>'
+        f'<div class="project-cover">\n                <img src="{cover}"{srcset_attrs(entry, cover, TILE_SIZES)}{dimension_attrs(entry)} alt="{title}" loading="lazy" />\n            </div>'
         if cover
         else '<div class="project-cover"></div>'
     )
@@ -144,7 +486,8 @@ def project_tile_html(project: dict[str, Any], base_path: str) -> str:
         </div>'''
 
 
-def carousel_item_html(project: dict[str, Any]) -> str:
+@profiled("carousel_item_html")
+def carousel_item_html(project: dict[str, Any], images: "ImageIndex | None" = None) -> str:
     base = "content/art" if project["category"] == "art" else "content/research"
     cover = (project.get("cover_image") or "").strip()
     if cover and not (cover.startswith("http://") or cover.startswith("https://")):
@@ -154,9 +497,10 @@ def carousel_item_html(project: dict[str, Any]) -> str:
     year_label_val = project.get("year_label") or ""
     short = (project.get("short_description") or "").strip()
     title = (project.get("title") or "Untitled").replace('"', "&quot;")
+    entry = images.get(cover) if images is not None else None
     return (
         f'<div class="carousel-item" data-project-slug="{project["slug"]}" data-project-category="{project["category"]}">'
-        f'<img src="{cover}" alt="{title}" loading="lazy" />'
+        f'<img src="{cover}"{srcset_attrs(entry, cover, CAROUSEL_SIZES)}{dimension_attrs(entry)} alt="{title}" loading="lazy" />'
         '<div class="carousel-overlay">'
         f"<h3>{project.get('title') or 'Untitled'}</h3>"
         + (f'<div class="carousel-year">{year_label_val}</div>' if year_label_val else "")
@@ -182,8 +526,7 @@ def minimal_md_to_html(text: str) -> str:
     return "\n".join(out)
 
 
-def extract_bio_html(bio_md_path: Path) -> str:
-    raw = bio_md_path.read_text(encoding="utf-8")
+def extract_bio_html(raw: str) -> str:
     raw = re.sub(r"^#\s+About\s*\n\n?", "", raw, flags=re.IGNORECASE)
     match = re.search(r"##\s+Bio\s*\n\n?([\s\S]*)$", raw, re.IGNORECASE)
     if match:
@@ -194,76 +537,12 @@ def extract_bio_html(bio_md_path: Path) -> str:
 
 
 def extract_publications_from_frontmatter(fm_text: str) -> list[dict[str, Any]]:
-    """Extract publications list from frontmatter (publications: then - authors: ... with indented key: value)."""
-    publications: list[dict[str, Any]] = []
-    in_publications = False
-    current: dict[str, Any] = {}
-    lines = fm_text.split("\n")
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-        if stripped == "publications:":
-            in_publications = True
-            i += 1
-            continue
-        if not in_publications:
-            i += 1
-            continue
-        # New paper: "  - authors: [...]" or "  - " at start of item
-        if re.match(r"^\s{2}-\s+", line):
-            if current:
-                publications.append(current)
-            current = {}
-            rest = line.lstrip()[2:].lstrip()  # after "  - "
-            if ":" in rest:
-                k, _, v = rest.partition(":")
-                k, v = k.strip(), v.strip().strip('"\'')
-                if k == "authors" and "[" in v:
-                    v = re.findall(r'"([^"]*)"', v)
-                elif k == "show_on_about":
-                    v = v.lower() not in ("false", "no", "0")
-                current[k] = v
-            i += 1
-            continue
-        # Indented key: value (4+ spaces)
-        if re.match(r"^\s{4}\w", line) and ":" in line:
-            k, _, v = line.strip().partition(":")
-            k, v = k.strip(), v.strip().strip('"\'')
-            if k == "authors" and "[" in v:
-                v = re.findall(r'"([^"]*)"', v)
-                current[k] = v
-            elif k == "show_on_about":
-                current[k] = v.lower() not in ("false", "no", "0")
-            elif k == "resources":
-                # Parse nested resources list (items at 6-space indent)
-                res_list, next_i = _parse_resources_list(lines, i + 1, 6)
-                current["resources"] = res_list
-                i = next_i
-                continue
-            else:
-                current[k] = v
-        i += 1
-    if current:
-        publications.append(current)
-    return publications
+    """Publications list of already split frontmatter text."""
+    return frontmatter_publications(parse_frontmatter_tree(fm_text))
 
 
-def aggregate_publications_html(content_dir: Path, research_list: list[str], base_path: str) -> str:
-    publications: list[dict[str, Any]] = []
-    for slug in research_list:
-        md_path = content_dir / "research" / slug / "index.md"
-        if not md_path.exists():
-            continue
-        raw = md_path.read_text(encoding="utf-8")
-        match = re.match(r"^---\s*\n([\s\S]*?)\n---\s*\n", raw)
-        if not match:
-            continue
-        fm = match.group(1)
-        for p in extract_publications_from_frontmatter(fm):
-            p["projectSlug"] = slug
-            p["projectTitle"] = parse_frontmatter(raw).get("title") or slug
-            publications.append(p)
+def aggregate_publications_html(publications: list[dict[str, Any]], base_path: str) -> str:
+    """Publications section for about.html from ContentStore.publications (newest first, show_on_about only)."""
     def _year_key(p: dict[str, Any]) -> int:
         y = p.get("year")
         if y is None:
@@ -272,7 +551,7 @@ def aggregate_publications_html(content_dir: Path, research_list: list[str], bas
             return int(y) if isinstance(y, (int, float)) else int(str(y).strip())
         except (ValueError, TypeError):
             return 0
-    publications.sort(key=lambda p: -_year_key(p))
+    publications = sorted(publications, key=lambda p: -_year_key(p))
     publications = [p for p in publications if p.get("show_on_about", True)]
     out = []
     for paper in publications:
@@ -306,110 +585,13 @@ def aggregate_publications_html(content_dir: Path, research_list: list[str], bas
     return "\n".join(out) if out else "<p>No publications found.</p>"
 
 
-def _yaml_value(s: str) -> str:
-    """Extract value from YAML-like string; handle quoted values containing colons."""
-    s = s.strip()
-    if not s:
-        return s
-    if s[0] in "\"'" and len(s) > 1:
-        end = s[0]
-        i = 1
-        while i < len(s):
-            if s[i] == "\\" and i + 1 < len(s):
-                i += 2
-                continue
-            if s[i] == end:
-                return s[1:i].replace("\\\"", '"').replace("\\'", "'")
-            i += 1
-    return s.strip('"\'') if s else s
-
-
-def _parse_resources_list(lines: list[str], start_i: int, indent: int) -> tuple[list[dict[str, str]], int]:
-    """Parse YAML-like resources list; return (list of {label, url}, index after list)."""
-    resources: list[dict[str, str]] = []
-    i = start_i
-    item: dict[str, str] = {}
-    while i < len(lines):
-        line = lines[i]
-        strip = line.strip()
-        if not strip:
-            i += 1
-            continue
-        line_indent = len(line) - len(line.lstrip())
-        if line_indent < indent and strip:
-            break
-        if strip.startswith("- ") and line_indent >= indent:
-            if item:
-                resources.append(item)
-            item = {}
-            rest = strip[2:].strip()
-            if ":" in rest:
-                k, _, v = rest.partition(":")
-                current_key = k.strip()
-                item[current_key] = _yaml_value(v)
-        elif line_indent >= indent + 2 and ":" in strip and item:
-            k, _, v = strip.partition(":")
-            item[k.strip()] = _yaml_value(v)
-        i += 1
-    if item:
-        resources.append(item)
-    return resources, i
-
-
 def _parse_list_from_frontmatter(fm_text: str, list_key: str) -> list[dict[str, Any]]:
     """Parse a top-level list (e.g. talks: or media:) with optional nested resources."""
-    items: list[dict[str, Any]] = []
-    lines = fm_text.split("\n")
-    in_list = False
-    list_indent = 0
-    current: dict[str, Any] = {}
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-        if stripped == list_key + ":":
-            in_list = True
-            list_indent = len(line) - len(line.lstrip())
-            i += 1
-            continue
-        if not in_list:
-            i += 1
-            continue
-        line_indent = len(line) - len(line.lstrip())
-        if line_indent <= list_indent and stripped:
-            break
-        if re.match(r"^\s{2}-\s+", line) and line_indent == list_indent + 2:
-            if current:
-                items.append(current)
-            current = {}
-            rest = line.lstrip()[2:].lstrip()
-            if ":" in rest:
-                k, _, v = rest.partition(":")
-                current[k.strip()] = _yaml_value(v)
-        elif stripped.startswith("resources:") and line_indent == list_indent + 4:
-            res_list, next_i = _parse_resources_list(lines, i + 1, line_indent + 2)
-            current["resources"] = res_list
-            i = next_i
-            continue
-        elif line_indent == list_indent + 4 and ":" in stripped and stripped.split(":")[0].strip() != "resources":
-            k, _, v = stripped.partition(":")
-            current[k.strip()] = _yaml_value(v)
-        i += 1
-    if current:
-        items.append(current)
-    return items
-
-
-def load_talks_html(content_dir: Path) -> str:
-    """Load content/about/talks.md and return three-column HTML for the Talks section."""
-    path = content_dir / "about" / "talks.md"
-    if not path.exists():
-        return ""
-    raw = path.read_text(encoding="utf-8")
-    match = re.match(r"^---\s*\n([\s\S]*?)\n---\s*\n", raw)
-    if not match:
-        return ""
-    talks = _parse_list_from_frontmatter(match.group(1), "talks")
+    return frontmatter_list(parse_frontmatter_tree(fm_text), list_key)
+
+
+def load_talks_html(talks: list[dict[str, Any]]) -> str:
+    """Three-column HTML for the Talks section from ContentStore.talks."""
     out = []
     for t in talks:
         title = (t.get("title") or "").replace('"', "&quot;")
@@ -429,16 +611,8 @@ def load_talks_html(content_dir: Path) -> str:
     return "\n".join(out) if out else ""
 
 
-def load_media_html(content_dir: Path) -> str:
-    """Load content/about/media.md and return three-column HTML for the Media Coverage section."""
-    path = content_dir / "about" / "media.md"
-    if not path.exists():
-        return ""
-    raw = path.read_text(encoding="utf-8")
-    match = re.match(r"^---\s*\n([\s\S]*?)\n---\s*\n", raw)
-    if not match:
-        return ""
-    items = _parse_list_from_frontmatter(match.group(1), "media")
+def load_media_html(items: list[dict[str, Any]]) -> str:
+    """Three-column HTML for the Media Coverage section from ContentStore.media."""
     out = []
     for m in items:
         desc = (m.get("description") or "").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
@@ -461,6 +635,279 @@ def load_media_html(content_dir: Path) -> str:
     return "\n".join(out) if out else ""
 
 
+def extract_resources(markdown: str) -> list[dict[str, str]]:
+    """Links listed under a "## Resources" heading in the markdown body."""
+    match = re.search(r"##\s+Resources\s*\n((?:- \[.*?\]\(.*?\)\s*\n?)+)", markdown, re.IGNORECASE)
+    if not match:
+        return []
+    return [{"label": label, "url": url} for label, url in re.findall(r"\[([^\]]+)\]\(([^)]+)\)", match.group(1))]
+
+
+def remove_resources_section(markdown: str) -> str:
+    return re.sub(r"##\s+Resources.*$", "", markdown, flags=re.IGNORECASE | re.DOTALL).strip()
+
+
+def _is_video_url(url: str) -> bool:
+    clean = str(url).split("#")[0].split("?")[0]
+    ext = clean.rpartition(".")[2].lower() if "." in clean else ""
+    return ext in ("mp4", "webm", "mov", "m4v", "ogv")
+
+
+def _media_figure_html(alt: str, url: str, title: str | None) -> str:
+    caption = title or alt
+    if _is_video_url(url):
+        tag = f'<video src="{url}" controls playsinline autoplay muted loop preload="metadata"></video>'
+    else:
+        tag = f'<img src="{url}" alt="{alt}" loading="lazy" />'
+    return f"<figure>{tag}{f'<figcaption>{caption}</figcaption>' if caption else ''}</figure>"
+
+
+def _table_html(match: re.Match) -> str:
+    lines = [line for line in match.group(0).strip().split("\n") if line.strip()]
+    if len(lines) < 2:
+        return match.group(0)
+    table = "<table>"
+    is_header = True
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if re.fullmatch(r"[|\s\-:]+", line):
+            is_header = False
+            continue
+        cells = [cell.strip() for cell in line.split("|") if cell.strip()]
+        if not cells:
+            continue
+        cell_tag = "th" if is_header else "td"
+        if is_header and i == 0:
+            table += "<thead><tr>"
+        elif not is_header and (i == 1 or (i > 1 and "<tbody>" not in table)):
+            table += "</thead><tbody><tr>"
+        else:
+            table += "<tr>"
+        table += "".join(f"<{cell_tag}>{cell}</{cell_tag}>" for cell in cells)
+        table += "</tr>"
+        is_header = False
+    return table + "</tbody></table>"
+
+
+def _extract_blockquotes(markdown: str) -> tuple[str, list[list[str]]]:
+    """Replace runs of "> " lines with numbered placeholders so block splitting can't break them."""
+    lines = markdown.split("\n")
+    out: list[str] = []
+    blocks: list[list[str]] = []
+    is_quote = lambda line: line.lstrip().startswith(">")  # noqa: E731
+    i = 0
+    while i < len(lines):
+        if not is_quote(lines[i]):
+            out.append(lines[i])
+            i += 1
+            continue
+        quote: list[str] = []
+        while i < len(lines):
+            if is_quote(lines[i]):
+                quote.append(lines[i])
+                i += 1
+                continue
+            # Blank lines stay inside the quote only if the quote continues after them.
+            if not lines[i].strip():
+                j = i + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                if j < len(lines) and is_quote(lines[j]):
+                    quote.append(">")
+                    i += 1
+                    continue
+            break
+        out.append(f'<blockquote data-md-quote="{len(blocks)}"></blockquote>')
+        blocks.append(quote)
+    return "\n".join(out), blocks
+
+
+_BLOCK_TAG_RE = re.compile(r"^<(h[1-6]|ul|ol|li|img|p|div|canvas|iframe|table|tr|td|th|figure|blockquote)")
+_MEDIA_RE = r'!\[([^\]]*)\]\(([^)]+)(?:\s+"([^"]+)")?\)'
+
+
+@profiled("markdown_to_html")
+def markdown_to_html(markdown: str, enable_blockquotes: bool = True) -> str:
+    """Project body markdown to HTML; same output as markdownToHTML in js/markdown-loader.js."""
+    html = markdown
+    quotes: list[list[str]] = []
+    if enable_blockquotes:
+        html, quotes = _extract_blockquotes(html)
+    # Media on consecutive lines become a side-by-side pair, the rest single figures.
+    html = re.sub(
+        _MEDIA_RE + r"\n" + _MEDIA_RE,
+        lambda m: f'<div class="image-pair">{_media_figure_html(*m.group(1, 2, 3))}{_media_figure_html(*m.group(4, 5, 6))}</div>',
+        html,
+    )
+    html = re.sub(_MEDIA_RE, lambda m: _media_figure_html(*m.group(1, 2, 3)), html)
+    html = re.sub(r"^### (.*$)", r"<h3>\1</h3>", html, flags=re.MULTILINE | re.IGNORECASE)
+    html = re.sub(r"^## (.*$)", r"<h2>\1</h2>", html, flags=re.MULTILINE | re.IGNORECASE)
+    html = re.sub(r"^# (.*$)", r"<h1>\1</h1>", html, flags=re.MULTILINE | re.IGNORECASE)
+    html = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", html)
+    html = re.sub(r"\*(.*?)\*", r"<em>\1</em>", html)
+    html = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2" class="link">\1</a>', html)
+    html = re.sub(r"^\- (.*$)", r"<li>\1</li>", html, flags=re.MULTILINE | re.IGNORECASE)
+    html = re.sub(r"(<li>.*</li>)", r"<ul>\1</ul>", html, count=1, flags=re.DOTALL)
+    html = re.sub(r"(\|.+\|\n)+", _table_html, html)
+
+    out = []
+    for block in re.split(r"\n\s*\n", html):
+        block = block.strip()
+        if not block:
+            continue
+        if _BLOCK_TAG_RE.match(block) or any(
+            tag in block for tag in ("<img", "<iframe", "<table", "<tr", "<figure", "<div", "<canvas")
+        ):
+            out.append(block)
+        else:
+            out.append(f"<p>{block}</p>")
+    html = "\n\n".join(out)
+
+    for idx, quote in enumerate(quotes):
+        inner = "\n".join(re.sub(r"^\s*>\s?", "", line) for line in quote).strip()
+        quote_html = f'<blockquote class="md-quote">\n{markdown_to_html(inner, enable_blockquotes=False)}\n</blockquote>'
+        html = html.replace(f'<blockquote data-md-quote="{idx}"></blockquote>', quote_html)
+    return html
+
+
+def _is_page_relative(url: str) -> bool:
+    return not (url.startswith(("http://", "https://", "/")))
+
+
+def _resolve_resource_url(url: str, project_prefix: str) -> str:
+    """Project-relative resource paths (e.g. media/file.pdf) become page-relative."""
+    raw = str(url or "").strip()
+    if not raw or re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", raw) or raw.startswith(("/", "./", "../")):
+        return raw
+    return raw if raw.startswith(project_prefix) else f"{project_prefix}{raw}"
+
+
+def _rewrite_img(match: re.Match, base_path: str, project_prefix: str, images: "ImageIndex | None" = None) -> str:
+    attributes = match.group(1)
+    src = re.search(r"""src\s*=\s*["']([^"']+)["']""", attributes, re.IGNORECASE)
+    if not src or not _is_page_relative(src.group(1)) or base_path in src.group(1):
+        return match.group(0)
+    resolved = f"{project_prefix}{src.group(1)}"
+    entry = images.get(resolved) if images is not None else None
+    # Capping sizes at the file's own width keeps the laid-out size what it was without srcset.
+    added = srcset_attrs(entry, resolved, f"min(100vw, {entry['width']}px)") if entry else ""
+    if not re.search(r"\b(width|height)\s*=", attributes, re.IGNORECASE):
+        added += dimension_attrs(entry, style=not re.search(r"\bstyle\s*=", attributes, re.IGNORECASE), reserve=True)
+    attributes = re.sub(
+        r"""src\s*=\s*["'][^"']+["']""", lambda _: f'src="{resolved}"{added}', attributes, count=1, flags=re.IGNORECASE
+    ).strip()
+    return f"<img {attributes}{' /' if match.group(0).strip().endswith('/>') else ''}>"
+
+
+def _resource_links_html(resources: list[Any], project_prefix: str, link_format: str) -> str:
+    """Resource links rendered through link_format (with {href} and {label}); empty URLs are dropped."""
+    links = []
+    for r in resources:
+        if isinstance(r, dict):
+            url, label = r.get("url") or "", r.get("label") or r.get("name") or "Link"
+        else:
+            url, label = r, "Link"
+        href = _resolve_resource_url(url, project_prefix) if url else ""
+        if href:
+            links.append(link_format.format(href=href, label=label))
+    return "".join(links)
+
+
+@profiled("project_detail_html")
+def project_detail_html(
+    project: dict[str, Any], parsed: "ParsedProject", base_path: str, images: "ImageIndex | None" = None
+) -> str:
+    """Pre-rendered detail view (what renderProjectDetail in js/markdown-loader.js builds), paths relative to the grid page."""
+    project_prefix = f"{base_path}/{project['path']}/"
+    resources: list[Any] = frontmatter_list(parsed.data, "resources") or extract_resources(parsed.body)
+    body_html = markdown_to_html(remove_resources_section(parsed.body))
+    body_html = re.sub(r"<img\s*([^>]*?)\s*/?>", lambda m: _rewrite_img(m, base_path, project_prefix, images), body_html, flags=re.IGNORECASE)
+    body_html = re.sub(
+        r'<video src="([^"]+)"',
+        lambda m: f'<video src="{project_prefix}{m.group(1)}"' if _is_page_relative(m.group(1)) else m.group(0),
+        body_html,
+    )
+
+    publications_html = ""
+    if parsed.publications:
+        items = []
+        for paper in parsed.publications:
+            authors = paper.get("authors") or ""
+            if isinstance(authors, list):
+                authors = ", ".join(authors)
+            citation = authors
+            if paper.get("title"):
+                citation += f' "{paper["title"]}"'
+            if paper.get("venue"):
+                citation += f' In: {paper["venue"]}'
+                citation = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a class="link" href="\2">\1</a>', citation)
+            if paper.get("year"):
+                citation += f', {paper["year"]}'
+            links = _resource_links_html(
+                paper.get("resources") or [], project_prefix, '<a class="resource-link" href="{href}" target="_blank">{label}</a>'
+            )
+            res_html = f'\n<div class="paper-resources">{links}</div>' if paper.get("resources") else ""
+            items.append(
+                f'<div class="publication-item publication-item-vertical" style="margin-bottom: 20px;">\n<p>{citation}</p>{res_html}\n</div>'
+            )
+        publications_html = (
+            '<div class="publications">\n<h3 style="margin: 0 0 20px 0;">Publications</h3>\n' + "".join(items) + "\n</div>"
+        )
+
+    names = []
+    for c in frontmatter_list(parsed.data, "collaborators"):
+        if c.get("name"):
+            names.append(f'<a href="{c["url"]}" class="link" target="_blank">{c["name"]}</a>' if c.get("url") else c["name"])
+    collaborators_html = (
+        '<div class="project-collaborators" style="margin-top: 5px; font-size: 0.9em; color: var(--text-color-secondary);">'
+        f'with {", ".join(names)}</div>'
+        if names
+        else ""
+    )
+
+    links = _resource_links_html(
+        resources, project_prefix, '<a href="{href}" class="resource-link" target="_blank" rel="noopener noreferrer">{label}</a>'
+    )
+    resources_html = f'<div class="paper-resources">\n{links}\n</div>' if links else ""
+    short = project.get("short_description") or ""
+    year_label_val = project.get("year_label") or project.get("year") or ""
+    meta_html = f'<div><span class="project-year">{year_label_val}</span>{collaborators_html}</div>' if year_label_val else collaborators_html
+    return "\n".join([
+        '<div class="project-detail-content">',
+        '<div class="project-detail-buttons">',
+        '<button class="project-close-button" onclick="closeProjectDetail()">',
+        '<span class="project-close-arrow">← </span><span class="project-close-text">Close</span><span class="project-close-esc"> (ESC)</span>',
+        "</button>",
+        '<button type="button" class="project-fullscreen-button" onclick="toggleProjectExpand()" aria-label="Expand (M)">',
+        '<span class="expand-label">Expand</span><span class="expand-shortcut"> (M)</span>',
+        '<span class="expand-arrow" aria-hidden="true">→</span>',
+        "</button>",
+        "</div>",
+        '<div class="project-detail-inner">',
+        '<div class="project-detail-header">',
+        f"<h1>{project.get('title')}</h1>",
+        f'<div class="project-meta">{meta_html}</div>',
+        (
+            '<div class="project-short-description-in-header"><p style="font-size: 1em; line-height: 1.6; '
+            f'color: var(--text-color-secondary); margin: 20px 0 0 0;">{short}</p></div>'
+            if short else ""
+        ),
+        "</div>",
+        (
+            '<div class="project-short-description"><p style="font-size: 1em; line-height: 1.6; '
+            f'color: var(--text-color-secondary); margin: 0;">{short}</p></div>'
+            if short else ""
+        ),
+        resources_html,
+        publications_html,
+        '<div class="project-detail-body">',
+        body_html,
+        "</div>",
+        "</div>",
+        "</div>",
+    ]) + "\n"
+
+
 def metadata_only(project: dict[str, Any]) -> dict[str, Any]:
     """Strip body/html/resources for embedding; keep what the grid and detail header need."""
     return {
@@ -483,175 +930,1491 @@ def metadata_only(project: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def project_index(projects: list[dict[str, Any]]) -> dict[str, Any]:
+    """Compact grid index inlined into art.html/research.html (decoded by readProjectIndex in js/scripts.js).
+
+    {"v": version, "n": shard size, "s": string table, "p": [[slug, title, year_label], ...]} where each row
+    holds indexes into "s", in grid order. Row i's full record is in shard i // n (see project_shards).
+    """
+    strings: list[str] = []
+    index: dict[str, int] = {}
+
+    def ref(value: Any) -> int:
+        value = "" if value is None else str(value)
+        if value not in index:
+            index[value] = len(strings)
+            strings.append(value)
+        return index[value]
+
+    rows = [[ref(p.get("slug")), ref(p.get("title")), ref(p.get("year_label"))] for p in projects]
+    return {"v": PROJECT_INDEX_VERSION, "n": PROJECT_SHARD_SIZE, "s": strings, "p": rows}
+
+
+def project_shards(projects: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Full grid/detail-header records in chunks of PROJECT_SHARD_SIZE, fetched by the detail view on demand."""
+    # id, path and category are implied by the slug and the page (readProjectIndex fills them in).
+    implied = ("id", "path", "category")
+    records = [{k: v for k, v in metadata_only(p).items() if v is not None and k not in implied} for p in projects]
+    return [records[i:i + PROJECT_SHARD_SIZE] for i in range(0, len(records), PROJECT_SHARD_SIZE)]
+
+
+def shard_count(projects: int) -> int:
+    return -(-projects // PROJECT_SHARD_SIZE)
+
+
+_SEARCH_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def search_tokens(text: str) -> list[str]:
+    """Lowercased, accent-folded words of text without stopwords and single characters.
+
+    js/scripts.js (searchSite) tokenizes queries the same way.
+    """
+    folded = "".join(c for c in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(c))
+    return [t for t in _SEARCH_TOKEN_RE.findall(folded) if len(t) > 1 and t not in SEARCH_STOPWORDS]
+
+
+def search_gaps(ids: list[int]) -> list[int]:
+    return [b - a for a, b in zip([0, *ids], ids)]
+
+
+def search_shard_key(term: str, length: int) -> str:
+    """The term's first length characters, with anything but ASCII letters and digits as "_" (file name safe)."""
+    return "".join(c if c.isascii() and c.isalnum() else "_" for c in term[:length])
+
+
+def search_shards(postings: dict[str, list[int]], terms: list[str], length: int = 1) -> dict[str, list[str]]:
+    """Group sorted terms by prefix, splitting groups over SEARCH_SHARD_BYTES on one more character.
+
+    Keys end up 1 to SEARCH_SHARD_MAX_PREFIX characters long; a query word needs every shard whose key is a prefix of
+    the word's key or starts with it.
+    """
+    groups: dict[str, list[str]] = {}
+    for term in terms:
+        groups.setdefault(search_shard_key(term, length), []).append(term)
+    shards = {}
+    for key, group in groups.items():
+        size = sum(len(term) + 4 + sum(len(str(p)) + 1 for p in postings[term]) for term in group)
+        if size > SEARCH_SHARD_BYTES and length < SEARCH_SHARD_MAX_PREFIX:
+            shards.update(search_shards(postings, group, length + 1))
+        else:
+            shards[key] = group
+    return shards
+
+
+def search_index(docs: list[tuple[list[str], str, list[str]]]) -> tuple[list[list[str]], dict[str, dict[str, Any]]]:
+    """Inverted index over docs given as (display row, title, other texts).
+
+    Returns the doc table and term shards keyed by a term prefix (see search_shards). A shard holds its
+    terms sorted (so prefixes are a binary search away) and per term the doc ids, as id * 2 + 1 when the
+    term occurs in the doc's title, sorted and stored as gaps to the previous one (small numbers, short JSON).
+    """
+    postings: dict[str, set[int]] = {}
+    for doc_id, (_, title, texts) in enumerate(docs):
+        title_terms = set(search_tokens(title))
+        for term in title_terms:
+            postings.setdefault(term, set()).add(doc_id * 2 + 1)
+        for text in texts:
+            for term in set(search_tokens(text)) - title_terms:
+                postings.setdefault(term, set()).add(doc_id * 2)
+    sorted_postings = {term: search_gaps(sorted(postings[term])) for term in sorted(postings)}
+    shards = {
+        key: {"t": terms, "p": [sorted_postings[term] for term in terms]}
+        for key, terms in search_shards(sorted_postings, list(sorted_postings)).items()
+    }
+    return [row for row, _, _ in docs], shards
+
+
+def project_meta(data: dict[str, Any], slug: str, category: str) -> dict[str, Any]:
+    """Grid/header metadata for one project from its frontmatter tree."""
+    meta = frontmatter_meta(data)
+    meta["slug"] = slug
+    meta["id"] = slug
+    meta["path"] = slug
+    meta["category"] = category
+    meta["year_label"] = year_label(meta)
+    meta["year"] = _grouping_year(meta) or None
+    return meta
+
+
+def sort_projects(projects: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    projects.sort(key=lambda p: (-_sort_ts(p), (p.get("title") or p.get("slug") or "")))
+    return projects
+
+
 def load_projects(content_dir: Path, base_path: str, slugs: list[str], category: str) -> list[dict[str, Any]]:
     projects = []
     for slug in slugs:
         md_path = content_dir / base_path / slug / "index.md"
         if not md_path.exists():
             continue
-        raw = md_path.read_text(encoding="utf-8")
-        meta = parse_frontmatter(raw)
-        meta["slug"] = slug
-        meta["id"] = slug
-        meta["path"] = slug
-        meta["category"] = category
-        meta["year_label"] = year_label(meta)
-        meta["year"] = _grouping_year(meta) or None
-        projects.append(meta)
-    projects.sort(key=lambda p: (-_sort_ts(p), (p.get("title") or p.get("slug") or "")))
-    return projects
+        fm = split_frontmatter(md_path.read_text(encoding="utf-8"))
+        projects.append(project_meta(parse_frontmatter_tree(fm) if fm is not None else {}, slug, category))
+    return sort_projects(projects)
+
+
+@dataclass
+class ParsedProject:
+    """One project index.md, read and parsed once. meta is None if the file is missing.
+
+    body is None when the project came from the parse cache; ContentStore.parsed_project loads it on demand.
+    """
+    meta: dict[str, Any] | None
+    data: dict[str, Any] = field(default_factory=dict)
+    body: str | None = ""
+    publications: list[dict[str, Any]] = field(default_factory=list)
+
+
+def markdown_body(raw: str) -> str:
+    """Markdown after the frontmatter block."""
+    match = FRONTMATTER_RE.match(raw)
+    return raw[match.end():] if match else raw
+
+
+@profiled("read + parse project")
+def parse_project_file(path: Path, slug: str, category: str) -> ParsedProject:
+    """Read and parse one project index.md.
+
+    Top-level so it can run in a worker process (see ContentStore.preload).
+    """
+    if not path.exists():
+        return ParsedProject(None)
+    raw = path.read_text(encoding="utf-8")
+    match = FRONTMATTER_RE.match(raw)
+    data = parse_frontmatter_tree(match.group(1)) if match else {}
+    return ParsedProject(
+        meta=project_meta(data, slug, category),
+        data=data,
+        body=raw[match.end():] if match else raw,
+        publications=frontmatter_publications(data),
+    )
+
+
+# Everything that shapes a cached entry; editing any of these drops the parse cache.
+PARSER_SOURCES: tuple[Any, ...] = (
+    FRONTMATTER_RE, _FM_LINE_RE, _INLINE_ITEM_RE, META_KEYS, _yaml_value, _inline_list, _scalar,
+    parse_frontmatter_tree, frontmatter_meta, frontmatter_list, frontmatter_publications,
+    year_label, _grouping_year, project_meta,
+)
+
+
+def parser_fingerprint() -> str:
+    h = hashlib.sha256()
+    for obj in PARSER_SOURCES:
+        text = obj.pattern if isinstance(obj, re.Pattern) else repr(obj) if isinstance(obj, tuple) else inspect.getsource(obj)
+        h.update(text.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+class ParseCache:
+    """Parsed frontmatter per content file, kept across builds in .cache/build/parse.json.
+
+    Entries are keyed by repo-relative path. A matching (size, mtime) is trusted as is; otherwise the
+    content hash decides, so a touched but unedited file keeps its entry. The whole cache is dropped
+    when the parser changes (parser_fingerprint) or the file format does (PARSE_CACHE_VERSION).
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = repo
+        self.path = repo / PARSE_CACHE_PATH
+        self.parser = parser_fingerprint()
+        try:
+            cache = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+        fresh = cache.get("version") == PARSE_CACHE_VERSION and cache.get("parser") == self.parser
+        self.entries: dict[str, dict[str, Any]] = cache.get("entries", {}) if fresh else {}
+        self.dirty = False
+        self.hits = self.misses = 0
+
+    def get(self, path: Path) -> dict[str, Any] | None:
+        rel = path.relative_to(self.repo).as_posix()
+        entry = self.entries.get(rel)
+        try:
+            st = path.stat() if entry else None
+        except OSError:
+            st = None
+        if entry is None or st is None:
+            self.misses += 1
+            return None
+        if entry["stat"] != [st.st_size, st.st_mtime_ns]:
+            if entry["sha"] != hashlib.sha256(path.read_bytes()).hexdigest():
+                self.misses += 1
+                return None
+            entry["stat"] = [st.st_size, st.st_mtime_ns]
+            self.dirty = True
+        self.hits += 1
+        return entry
+
+    def put(self, path: Path, entry: dict[str, Any]) -> None:
+        try:
+            st = path.stat()
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return
+        self.entries[path.relative_to(self.repo).as_posix()] = {"stat": [st.st_size, st.st_mtime_ns], "sha": digest, **entry}
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        cache = {"version": PARSE_CACHE_VERSION, "parser": self.parser, "entries": self.entries}
+        write_output(self.path, json.dumps(cache, separators=(",", ":"), sort_keys=True))
+        self.dirty = False
+
+
+def _exif_orientation(tiff: bytes) -> int:
+    """EXIF Orientation tag (1-8) from a TIFF block, 1 if absent or unreadable."""
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if not endian:
+        return 1
+    try:
+        (ifd,) = struct.unpack(endian + "I", tiff[4:8])
+        (count,) = struct.unpack(endian + "H", tiff[ifd:ifd + 2])
+        for i in range(count):
+            entry = ifd + 2 + 12 * i
+            tag, _, _, value = struct.unpack(endian + "HHIH", tiff[entry:entry + 10])
+            if tag == 0x0112:
+                return value
+    except struct.error:
+        pass
+    return 1
+
+
+def read_image_size(f: BinaryIO) -> tuple[int, int] | None:
+    """(width, height) as displayed, from the header of a JPEG, PNG, GIF or WebP file (no pixel decoding).
+
+    JPEGs are walked marker by marker up to the frame header, honouring an EXIF rotation on the way.
+    None for other formats (SVG, video) or truncated files.
+    """
+    head = f.read(30)
+    try:
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                b0, b1, b2, b3 = head[21:25]
+                return 1 + (((b1 & 0x3F) << 8) | b0), 1 + (((b3 & 0x0F) << 10) | (b2 << 2) | (b1 >> 6))
+            if chunk == b"VP8X":
+                return 1 + int.from_bytes(head[24:27], "little"), 1 + int.from_bytes(head[27:30], "little")
+            return None
+        if head[:2] != b"\xff\xd8":
+            return None
+        f.seek(2)
+        orientation = 1
+        while True:
+            byte = f.read(1)
+            while byte and byte != b"\xff":
+                byte = f.read(1)
+            while byte == b"\xff":
+                byte = f.read(1)  # fill bytes
+            if not byte:
+                return None
+            marker = byte[0]
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                continue  # standalone markers carry no length
+            if marker in (0xD9, 0xDA):
+                return None  # end of image / scan data before any frame header
+            (length,) = struct.unpack(">H", f.read(2))
+            if marker == 0xE1:
+                payload = f.read(length - 2)
+                if payload.startswith(b"Exif\0\0"):
+                    orientation = _exif_orientation(payload[6:])
+            elif 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">xHH", f.read(5))
+                return (height, width) if orientation in (5, 6, 7, 8) else (width, height)
+            else:
+                f.seek(length - 2, 1)
+    except struct.error:
+        return None
+
+
+class ImageSizes:
+    """Intrinsic sizes of local images, kept across builds in .cache/build/images.json.
+
+    Entries are keyed by repo-relative path and trusted while the file's (size, mtime) is unchanged, so an
+    unchanged image costs a stat and a changed one a header read. The content hash, which only the responsive
+    manifest check needs, is computed on demand and kept in the same entry. Entries made in --jobs workers go
+    back with each rendered output (take_new) and are merged into the main process's cache before it is saved.
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = repo
+        self.path = repo / IMAGE_SIZES_PATH
+        try:
+            cache = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+        fresh = cache.get("version") == IMAGE_SIZES_VERSION
+        self.entries: dict[str, dict[str, Any]] = cache.get("entries", {}) if fresh else {}
+        self.new: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+
+    def _put(self, rel: str, entry: dict[str, Any]) -> None:
+        self.entries[rel] = self.new[rel] = entry
+        self.dirty = True
+
+    def _entry(self, rel: str) -> dict[str, Any] | None:
+        path = self.repo / rel
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        entry = self.entries.get(rel)
+        if entry is None or entry["stat"] != [st.st_size, st.st_mtime_ns]:
+            try:
+                with open(path, "rb") as f:
+                    size = read_image_size(f)
+            except OSError:
+                return None
+            entry = {"stat": [st.st_size, st.st_mtime_ns], "size": list(size) if size else None}
+            self._put(rel, entry)
+        return entry
+
+    def lookup(self, rel: str) -> tuple[int, int] | None:
+        """(width, height) of a repo-relative image, or None if missing or not a known format."""
+        entry = self._entry(rel)
+        return (entry["size"][0], entry["size"][1]) if entry and entry["size"] else None
+
+    def digest(self, rel: str) -> str | None:
+        """Content hash of a repo-relative image (what the responsive manifest records), hashed once per (size, mtime)."""
+        entry = self._entry(rel)
+        if entry is None:
+            return None
+        if "sha" not in entry:
+            try:
+                digest = hashlib.sha256((self.repo / rel).read_bytes()).hexdigest()
+            except OSError:
+                return None
+            entry = {**entry, "sha": digest}
+            self._put(rel, entry)
+        return entry["sha"]
+
+    def take_new(self) -> dict[str, dict[str, Any]]:
+        """Entries added or updated since the last call."""
+        new, self.new = self.new, {}
+        return new
+
+    def merge(self, entries: dict[str, dict[str, Any]]) -> None:
+        if entries:
+            self.entries.update(entries)
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.entries = {rel: entry for rel, entry in self.entries.items() if (self.repo / rel).exists()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        cache = {"version": IMAGE_SIZES_VERSION, "entries": self.entries}
+        write_output(self.path, json.dumps(cache, separators=(",", ":"), sort_keys=True))
+        self.new = {}
+        self.dirty = False
+
+
+class ImageIndex:
+    """What the pages know about a local image, by repo-relative path: its intrinsic width/height (ImageSizes)
+    plus, while the hash still matches, its responsive manifest entry (variants, placeholder).
+
+    Every path looked up is remembered in `used`, so the build can record those images as page inputs.
+    """
+
+    def __init__(self, manifest: dict[str, Any], sizes: ImageSizes) -> None:
+        self.manifest = manifest
+        self.sizes = sizes
+        self.used: set[str] = set()
+
+    def get(self, src: str, default: Any = None) -> dict[str, Any] | None:
+        if not src or "://" in src:
+            return default
+        self.used.add(src)
+        found = self.sizes.lookup(src)
+        if found is None:
+            return default
+        width, height = found
+        entry = self.manifest.get(src)
+        if entry and entry.get("sha") == self.sizes.digest(src):
+            return {**entry, "width": width, "height": height}
+        return {"width": width, "height": height}
+
+
+class ContentStore:
+    """Reads and parses each content file at most once per build; shared by all page builders.
+
+    Everything is parsed lazily, so pages skipped by the incremental build never touch their inputs.
+    """
+
+    def __init__(
+        self,
+        content_dir: Path,
+        art_list: list[str],
+        research_list: list[str],
+        cache: ParseCache | None = None,
+        image_sizes: ImageSizes | None = None,
+    ) -> None:
+        self.content_dir = content_dir
+        self.slugs = {"art": art_list, "research": research_list}
+        self.cache = cache
+        # Sent to each worker once (init_render_worker); what they look up comes back through render_output
+        # (ImageSizes.take_new).
+        self.image_sizes = image_sizes or ImageSizes(content_dir.parent)
+        self._frontmatter: dict[Path, str | None] = {}
+        self._raw: dict[Path, str | None] = {}
+        self._parsed: dict[tuple[str, str], ParsedProject] = {}
+        self._projects: dict[str, list[dict[str, Any]]] = {}
+        self._templates: dict[Path, "Template"] = {}
+
+    def raw(self, path: Path) -> str | None:
+        """File text, or None if the file does not exist."""
+        if path not in self._raw:
+            self._raw[path] = path.read_text(encoding="utf-8") if path.exists() else None
+        return self._raw[path]
+
+    def frontmatter(self, path: Path) -> str | None:
+        """Frontmatter text of a markdown file, or None if the file or its frontmatter is missing."""
+        if path not in self._frontmatter:
+            raw = self.raw(path)
+            self._frontmatter[path] = split_frontmatter(raw) if raw is not None else None
+        return self._frontmatter[path]
+
+    def template(self, path: Path) -> "Template":
+        """A shared template (the project page shell), indexed once per store rather than once per page."""
+        if path not in self._templates:
+            self._templates[path] = Template(path)
+        return self._templates[path]
 
+    def project_path(self, category: str, slug: str) -> Path:
+        return self.content_dir / category / slug / "index.md"
 
-def build_index(repo: Path, content_dir: Path, art_list: list[str], research_list: list[str]) -> None:
+    def __getstate__(self) -> dict[str, Any]:
+        # Workers only read what the main process already parsed; the cache is saved by the main process.
+        return {**self.__dict__, "cache": None}
+
+    def _cached_project(self, path: Path) -> ParsedProject | None:
+        entry = self.cache.get(path) if self.cache else None
+        if entry is None:
+            return None
+        return ParsedProject(entry["meta"], entry["data"], None, frontmatter_publications(entry["data"]))
+
+    def _store_project(self, path: Path, parsed: ParsedProject) -> None:
+        if self.cache and parsed.meta is not None:
+            self.cache.put(path, {"meta": parsed.meta, "data": parsed.data})
+
+    def parsed_project(self, category: str, slug: str, with_body: bool = False) -> ParsedProject:
+        key = (category, slug)
+        path = self.project_path(category, slug)
+        if key not in self._parsed:
+            parsed = self._cached_project(path)
+            if parsed is None:
+                parsed = parse_project_file(path, slug, category)
+                self._store_project(path, parsed)
+            self._parsed[key] = parsed
+        parsed = self._parsed[key]
+        if with_body and parsed.body is None:
+            parsed.body = markdown_body(self.raw(path) or "")
+        return parsed
+
+    def preload(self, executor: Executor, workers: int) -> None:
+        """Read and parse every project file not parsed (or cached) yet, fanned out over executor."""
+        keys = []
+        for c, slugs in self.slugs.items():
+            for slug in slugs:
+                if (c, slug) in self._parsed:
+                    continue
+                cached = self._cached_project(self.project_path(c, slug))
+                if cached is None:
+                    keys.append((c, slug))
+                else:
+                    self._parsed[(c, slug)] = cached
+        if not keys:
+            return
+        paths = [self.project_path(c, slug) for c, slug in keys]
+        results = executor.map(
+            parse_project_file,
+            paths,
+            [slug for _, slug in keys],
+            [c for c, _ in keys],
+            chunksize=max(1, len(keys) // (workers * 4)),
+        )
+        for key, path, parsed in zip(keys, paths, results):
+            self._parsed[key] = parsed
+            self._store_project(path, parsed)
+
+    def projects(self, category: str) -> list[dict[str, Any]]:
+        """Projects of one category that have an index.md, newest first."""
+        if category not in self._projects:
+            parsed = (self.parsed_project(category, slug).meta for slug in self.slugs[category])
+            self._projects[category] = sort_projects([meta for meta in parsed if meta is not None])
+        return self._projects[category]
+
+    @cached_property
+    def publications(self) -> list[dict[str, Any]]:
+        """All research publications in projects.json order, tagged with their project slug and title."""
+        titles = {p["slug"]: p.get("title") for p in self.projects("research")}
+        publications: list[dict[str, Any]] = []
+        for slug in self.slugs["research"]:
+            for p in self.parsed_project("research", slug).publications:
+                p = dict(p)
+                p["projectSlug"] = slug
+                p["projectTitle"] = titles.get(slug) or slug
+                publications.append(p)
+        return publications
+
+    def _about_list(self, name: str, list_key: str) -> list[dict[str, Any]]:
+        path = self.content_dir / "about" / name
+        entry = self.cache.get(path) if self.cache else None
+        if entry is None:
+            fm = self.frontmatter(path)
+            if fm is None:
+                return []
+            entry = {"data": parse_frontmatter_tree(fm)}
+            if self.cache:
+                self.cache.put(path, entry)
+        return frontmatter_list(entry["data"], list_key)
+
+    @cached_property
+    def talks(self) -> list[dict[str, Any]]:
+        return self._about_list("talks.md", "talks")
+
+    @cached_property
+    def media(self) -> list[dict[str, Any]]:
+        return self._about_list("media.md", "media")
+
+    @cached_property
+    def images(self) -> ImageIndex:
+        """Size, srcset variants and placeholder per repo-relative image path (responsive manifest + headers)."""
+        raw = self.raw(self.content_dir / SRCSET_MANIFEST)
+        try:
+            manifest = json.loads(raw).get("images", {}) if raw else {}
+        except ValueError:
+            manifest = {}
+        return ImageIndex(manifest, self.image_sizes)
+
+    @cached_property
+    def bio(self) -> str | None:
+        return self.raw(self.content_dir / "about" / "bio.md")
+
+    def invalidate(self, paths: set[Path]) -> None:
+        """Forget what was read from paths and everything aggregated from them (dev.py keeps one store alive)."""
+        if not paths:
+            return
+        for path in paths:
+            self._raw.pop(path, None)
+            self._frontmatter.pop(path, None)
+            self._templates.pop(path, None)
+        self._parsed = {key: p for key, p in self._parsed.items() if self.project_path(*key) not in paths}
+        self._projects.clear()
+        for name in ("publications", "talks", "media", "images", "bio"):
+            self.__dict__.pop(name, None)
+
+
+SLOT_MARKER_RE = re.compile(r"<!-- ([A-Z][A-Z0-9_]*)_(START|END) -->")
+
+
+class Template:
+    """A page with named <!-- NAME_START --> ... <!-- NAME_END --> slots, indexed once per file.
+
+    render() splices every slot in a single pass and fails loudly if a requested slot is missing.
+    """
+
+    @profiled("template index")
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.html = path.read_text(encoding="utf-8")
+        self.slots: dict[str, tuple[int, int, str]] = {}
+        open_slots: dict[str, int] = {}
+        for m in SLOT_MARKER_RE.finditer(self.html):
+            name, kind = m.group(1), m.group(2)
+            if kind == "START":
+                if name in open_slots or name in self.slots:
+                    raise SystemExit(f"{path.name}: duplicate slot {name}")
+                open_slots[name] = m.end()
+            else:
+                if name not in open_slots:
+                    raise SystemExit(f"{path.name}: {name}_END without {name}_START")
+                line_start = self.html.rfind("\n", 0, m.start()) + 1
+                indent = self.html[line_start:m.start()]
+                self.slots[name] = (open_slots.pop(name), m.start(), indent if not indent.strip() else "")
+        if open_slots:
+            raise SystemExit(f"{path.name}: unclosed slot(s) {', '.join(sorted(open_slots))}")
+
+    @profiled("template splice")
+    def render(self, fills: dict[str, str]) -> str:
+        """Replace the contents of each named slot; the END marker keeps its own line and indentation."""
+        missing = sorted(set(fills) - set(self.slots))
+        if missing:
+            raise SystemExit(f"{self.path.name}: missing slot(s) {', '.join(missing)}")
+        out = []
+        pos = 0
+        for name, (start, end, indent) in sorted(self.slots.items(), key=lambda item: item[1][0]):
+            if name not in fills:
+                continue
+            out.append(self.html[pos:start])
+            out.append(f"\n{fills[name]}\n{indent}")
+            pos = end
+        out.append(self.html[pos:])
+        return "".join(out)
+
+    def write(self, fills: dict[str, str]) -> bool:
+        return write_output(self.path, self.render(fills))
+
+
+def build_index(repo: Path, store: ContentStore) -> bool:
     highlighted = [
-        p for p in load_projects(content_dir, "art", art_list, "art") if p.get("highlight")
-    ] + [p for p in load_projects(content_dir, "research", research_list, "research") if p.get("highlight")]
+        p for p in store.projects("art") if p.get("highlight")
+    ] + [p for p in store.projects("research") if p.get("highlight")]
     highlighted.sort(key=lambda p: (-_sort_ts(p), (p.get("title") or p.get("slug") or "")))
 
-    carousel_inner = "".join(carousel_item_html(p) for p in highlighted) * 3
-    block = f"<!-- CAROUSEL_START -->\n            {carousel_inner}\n            <!-- CAROUSEL_END -->"
-    index_path = repo / "index.html"
-    html = index_path.read_text(encoding="utf-8")
-    pattern = re.compile(r"<!-- CAROUSEL_START -->[\s\S]*?<!-- CAROUSEL_END -->", re.DOTALL)
-    new_html = pattern.sub(block, html, count=1)
-    if new_html == html and "<!-- CAROUSEL_START -->" not in html:
-        new_html, n = re.subn(
-            r'(<div class="carousel-track">)\s*<!-- Carousel items will be dynamically loaded here -->\s*(</div>)',
-            rf"\1\n            {block}\n        \2",
-            html,
-            count=1,
-        )
-        if n != 1:
-            raise SystemExit("Could not find .carousel-track placeholder in index.html")
-    if new_html != html:
-        index_path.write_text(new_html, encoding="utf-8")
-    print(f"  index: carousel ({len(highlighted)} highlighted)")
-
-
-def build_art(repo: Path, content_dir: Path, art_list: list[str]) -> None:
-    base_path = "content/art"
-    projects = load_projects(content_dir, "art", art_list, "art")
-    grid_html = "\n".join(project_tile_html(p, base_path) for p in projects)
-    data_json = json.dumps([metadata_only(p) for p in projects], ensure_ascii=False)
-
-    art_path = repo / "art.html"
-    html = art_path.read_text(encoding="utf-8")
-    # Replace grid placeholder or existing pre-rendered grid
-    if 'id="projects-data"' in html:
-        html = re.sub(
-            r'(<div id="projects-grid" class="projects-grid">)\s*[\s\S]*?(\s*</div>\s*<script type="application/json" id="projects-data">)[\s\S]*?(</script>)',
-            rf'\1\n{grid_html}\n        \2\n{data_json}\n        \3',
-            html,
-            count=1,
-            flags=re.DOTALL,
-        )
-    else:
-        html = re.sub(
-            r'(<div id="projects-grid" class="projects-grid">)\s*<!-- Project tiles will be dynamically loaded here -->\s*</div>',
-            rf'\1\n{grid_html}\n                </div>\n                <script type="application/json" id="projects-data">\n{data_json}\n                </script>',
-            html,
-            count=1,
-        )
-    art_path.write_text(html, encoding="utf-8")
-    print(f"  art: grid ({len(projects)} projects)")
-
-
-def build_research(repo: Path, content_dir: Path, research_list: list[str]) -> None:
-    base_path = "content/research"
-    projects = load_projects(content_dir, "research", research_list, "research")
-    grid_html = "\n".join(project_tile_html(p, base_path) for p in projects)
-    data_json = json.dumps([metadata_only(p) for p in projects], ensure_ascii=False)
-
-    research_path = repo / "research.html"
-    html = research_path.read_text(encoding="utf-8")
-    if 'id="projects-data"' in html:
-        html = re.sub(
-            r'(<div id="projects-grid" class="projects-grid">)\s*[\s\S]*?(\s*</div>\s*<script type="application/json" id="projects-data">)[\s\S]*?(</script>)',
-            rf'\1\n{grid_html}\n        \2\n{data_json}\n        \3',
-            html,
-            count=1,
-            flags=re.DOTALL,
-        )
-    else:
-        html = re.sub(
-            r'(<div id="projects-grid" class="projects-grid">)\s*<!-- Project tiles will be dynamically loaded here -->\s*</div>',
-            rf'\1\n{grid_html}\n                </div>\n                <script type="application/json" id="projects-data">\n{data_json}\n                </script>',
-            html,
-            count=1,
-        )
-    research_path.write_text(html, encoding="utf-8")
-    print(f"  research: grid ({len(projects)} projects)")
+    # Each item once; js/carousel.js clones the set on both sides for the seamless loop.
+    carousel_inner = "".join(carousel_item_html(p, store.images) for p in highlighted)
+    path = repo / "index.html"
+    before = path.stat().st_size if path.exists() else 0
+    page = Template(path).render({"CAROUSEL": f"            {carousel_inner}"})
+    written = write_output(path, page)
+    after = len(page.encode("utf-8"))
+    size = f"index.html {before / 1024:.1f} KB -> {after / 1024:.1f} KB" if written else f"index.html {after / 1024:.1f} KB"
+    print(f"  index: carousel ({len(highlighted)} highlighted, {size}{unchanged_note(written)})")
+    return written
+
 
+def build_grid(repo: Path, store: ContentStore, category: str) -> bool:
+    base_path = f"content/{category}"
+    projects = store.projects(category)
+    index_json = json.dumps(project_index(projects), ensure_ascii=False, separators=(",", ":"))
+    fills = {
+        "GRID": "\n".join(project_tile_html(p, base_path, store.images) for p in projects),
+        "PROJECTS_DATA": (
+            '                <script type="application/json" id="projects-data">\n'
+            f"{index_json}\n"
+            "                </script>"
+        ),
+    }
+    page = Template(repo / f"{category}.html").render(fills)
+    written = write_output(repo / f"{category}.html", page)
+    shards = project_shards(projects)
+    shard_bytes = 0
+    for n, shard in enumerate(shards):
+        text = json.dumps(shard, ensure_ascii=False, separators=(",", ":"))
+        shard_bytes += len(text.encode("utf-8"))
+        written = write_output(repo / base_path / PROJECT_SHARD.format(n=n), text) or written
+    for stale in (repo / base_path).glob(PROJECT_SHARD.format(n="*")):
+        if stale.name not in {PROJECT_SHARD.format(n=n) for n in range(len(shards))}:
+            stale.unlink()
+            written = True
+    print(
+        f"  {category}: grid ({len(projects)} projects, page {len(page.encode('utf-8')) / 1024:.1f} KB, "
+        f"index {len(fills['PROJECTS_DATA'].encode('utf-8')) / 1024:.1f} KB inline, "
+        f"{len(shards)} shard(s) {shard_bytes / 1024:.1f} KB{unchanged_note(written)})"
+    )
+    return written
 
-def build_about(repo: Path, content_dir: Path, research_list: list[str]) -> None:
-    bio_md = content_dir / "about" / "bio.md"
-    about_path = repo / "about.html"
-    bio_html = extract_bio_html(bio_md) if bio_md.exists() else "<p></p>"
-    pub_html = aggregate_publications_html(content_dir, research_list, "content/research")
-    talks_html = load_talks_html(content_dir)
-    media_html = load_media_html(content_dir)
 
-    html = about_path.read_text(encoding="utf-8")
-    # Bio: replace placeholder or existing content inside #bio-container
-    html = re.sub(
-        r'(<div id="bio-container">)\s*<!-- Bio will be dynamically loaded here -->\s*</div>',
-        rf"\1\n{bio_html}\n                                </div>",
-        html,
-        count=1,
+def build_art(repo: Path, store: ContentStore) -> bool:
+    return build_grid(repo, store, "art")
+
+
+def build_research(repo: Path, store: ContentStore) -> bool:
+    return build_grid(repo, store, "research")
+
+
+def build_about(repo: Path, store: ContentStore) -> bool:
+    written = Template(repo / "about.html").write({
+        "BIO": extract_bio_html(store.bio) if store.bio is not None else "<p></p>",
+        "PUBLICATIONS": aggregate_publications_html(store.publications, "content/research"),
+        "TALKS": load_talks_html(store.talks),
+        "MEDIA": load_media_html(store.media),
+    })
+    print(f"  about: bio + publications + talks + media{unchanged_note(written)}")
+    return written
+
+
+def search_docs(store: ContentStore) -> list[tuple[list[str], str, list[str]]]:
+    """Searchable docs: every project, publication and talk as ([type, title, url, subtitle], title, texts)."""
+    docs = []
+    for category in ("art", "research"):
+        for project in store.projects(category):
+            parsed = store.parsed_project(category, project["slug"])
+            names = [c.get("name") or "" for c in frontmatter_list(parsed.data, "collaborators")]
+            title = project.get("title") or project["slug"]
+            row = [category, title, f"{category}.html#{project['slug']}", project.get("year_label") or ""]
+            docs.append((row, title, [project.get("short_description") or "", *names]))
+    for paper in store.publications:
+        authors = paper.get("authors") or ""
+        venue = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", str(paper.get("venue") or ""))
+        title = str(paper.get("title") or "")
+        subtitle = ", ".join(str(part) for part in (venue, paper.get("year")) if part)
+        row = ["publication", title, f"research.html#{paper['projectSlug']}", subtitle]
+        docs.append((row, title, [venue, ", ".join(authors) if isinstance(authors, list) else str(authors)]))
+    for talk in store.talks:
+        title = talk.get("title") or ""
+        venue = talk.get("venue") or ""
+        subtitle = ", ".join(part for part in (venue, talk.get("year") or "") if part)
+        docs.append((["talk", title, "about.html", subtitle], title, [venue]))
+    return docs
+
+
+def build_search(repo: Path, store: ContentStore) -> bool:
+    """Write the search index to content/search/: a small index.json (stopwords, shard keys, doc count), the doc
+    rows in docs-<n>.json shards of SEARCH_DOCS_PER_SHARD and the term shards, so a query fetches a few KB."""
+    rows, shards = search_index(search_docs(store))
+    folder = repo / SEARCH_DIR
+    folder.mkdir(parents=True, exist_ok=True)
+    files = {}
+    for n in range(0, len(rows), SEARCH_DOCS_PER_SHARD):
+        files[SEARCH_DOCS.format(n=n // SEARCH_DOCS_PER_SHARD)] = {"d": rows[n:n + SEARCH_DOCS_PER_SHARD]}
+    for key, shard in shards.items():
+        files[SEARCH_SHARD.format(key=key)] = shard
+    files[SEARCH_INDEX] = {
+        "stop": list(SEARCH_STOPWORDS), "shards": sorted(shards), "docs": len(rows), "per": SEARCH_DOCS_PER_SHARD,
+    }
+    written = False
+    sizes = {}
+    for name, data in files.items():
+        text = json.dumps({"v": SEARCH_INDEX_VERSION, **data}, ensure_ascii=False, separators=(",", ":"))
+        sizes[name] = len(text.encode("utf-8"))
+        written = write_output(folder / name, text) or written
+    for stale in search_files(repo):
+        if stale.name not in files:
+            stale.unlink()
+            written = True
+    term_sizes = [sizes[SEARCH_SHARD.format(key=key)] for key in shards]
+    print(
+        f"  search: {len(rows)} docs, {sum(len(s['t']) for s in shards.values())} terms, index "
+        f"{sizes[SEARCH_INDEX] / 1024:.1f} KB, {len(files) - len(shards) - 1} doc shard(s), {len(shards)} term shard(s) "
+        f"{sum(term_sizes) / 1024:.1f} KB (largest {max(term_sizes, default=0) / 1024:.1f} KB){unchanged_note(written)}"
     )
-    if "<!-- Bio will be dynamically loaded here -->" not in html:
-        html = re.sub(
-            r'(<div id="bio-container">)[\s\S]*?(</div>)',
-            rf"\1\n{bio_html}\n                                \2",
-            html,
-            count=1,
-        )
-    # Publications: replace placeholder or existing content (match up to next about-section)
-    html = re.sub(
-        r'(<div class="section-content" id="publications-container">)\s*<!-- Publications will be dynamically loaded here -->\s*</div>',
-        rf"\1\n{pub_html}\n                                    </div>",
-        html,
-        count=1,
+    return written
+
+
+def search_files(repo: Path) -> list[Path]:
+    """The doc and term shards in content/search/ now."""
+    folder = repo / SEARCH_DIR
+    return sorted([*folder.glob(SEARCH_DOCS.format(n="*")), *folder.glob(SEARCH_SHARD.format(key="*"))])
+
+
+def detail_output(category: str, slug: str) -> str:
+    return f"content/{category}/{slug}/{DETAIL_FRAGMENT}"
+
+
+def build_detail(repo: Path, store: ContentStore, output: str) -> bool:
+    """Write the pre-rendered detail fragment that js/scripts.js injects when a tile is opened."""
+    _, category, slug, _ = Path(output).parts
+    parsed = store.parsed_project(category, slug, with_body=True)
+    if parsed.meta is None:
+        return False
+    return write_output(repo / output, project_detail_html(parsed.meta, parsed, f"content/{category}", store.images))
+
+
+def project_page_output(category: str, slug: str) -> str:
+    return f"content/{category}/{slug}/{PROJECT_PAGE}"
+
+
+def project_url(category: str, slug: str) -> str:
+    return f"{SITE_URL}/{project_page_output(category, slug).removesuffix(PROJECT_PAGE)}"
+
+
+def project_page_html(template: Template, project: dict[str, Any], category: str, detail: str) -> str:
+    """The standalone page of one project: the project shell (PROJECT_PAGE_TEMPLATE) with its own URL, title and
+    description, the detail view open and a link to the category's grid page (which it does not embed)."""
+    slug = project["slug"]
+    title = f"{project.get('title') or slug} - Alexander Koenig".replace('"', "&quot;")
+    description = (project.get("short_description") or "").strip().replace('"', "&quot;") or "Alexander Koenig"
+    url = project_url(category, slug)
+    meta = [
+        f'<meta name="description" content="{description}">',
+        f'<link rel="canonical" href="{url}">',
+        '<meta property="og:type" content="website">',
+        f'<meta property="og:title" content="{title}">',
+        f'<meta property="og:description" content="{description}">',
+        f'<meta property="og:url" content="{url}">',
+        '<meta property="twitter:card" content="summary">',
+        f'<meta property="twitter:title" content="{title}">',
+        f'<meta property="twitter:description" content="{description}">',
+        f"<title>{title}</title>",
+    ]
+    main = (
+        f'                <p class="project-page-grid-link"><a href="{category}.html">All {category} projects</a></p>\n'
+        f'                <div id="project-detail" class="project-detail-view active" data-project-page="{slug}" '
+        f'data-grid-page="{category}.html" data-prerendered>\n{detail}\n                </div>\n'
+        f"                <script>window.projectBasePath = 'content/{category}';</script>"
     )
-    if "<!-- Publications will be dynamically loaded here -->" not in html:
-        html = re.sub(
-            r'(<div class="section-content" id="publications-container">)[\s\S]*?(</div>\s*</div>\s*<div class="about-section">)',
-            rf"\1\n{pub_html}\n                                    \2",
-            html,
-            count=1,
-        )
-    # Talks: replace section content
-    html = re.sub(
-        r'(<div class="about-section">\s*<h2>Talks</h2>\s*<div class="section-content">)[\s\S]*?(</div>\s*</div>\s*<div class="about-section">\s*<h2>Media Coverage</h2>)',
-        rf"\1\n{talks_html}\n                                \2",
-        html,
-        count=1,
+    return template.render({"META": "\n".join(f"    {line}" for line in meta), "MAIN": main})
+
+
+def build_project_page(repo: Path, store: ContentStore, output: str) -> bool:
+    """Write the standalone page of one project: the project shell with its detail view pre-rendered and open.
+
+    Only the project's own content goes in, so a page is re-rendered when that project (or the shell) changes,
+    not when another project of its category does.
+    """
+    _, category, slug, _ = Path(output).parts
+    parsed = store.parsed_project(category, slug, with_body=True)
+    if parsed.meta is None:
+        return False
+    detail = project_detail_html(parsed.meta, parsed, f"content/{category}", store.images)
+    if parsed.meta.get("custom_js"):
+        detail += f'\n<script src="content/{category}/{slug}/{parsed.meta["custom_js"]}" data-custom-js="{slug}"></script>'
+    template = store.template(repo / PROJECT_PAGE_TEMPLATE)
+    return write_output(repo / output, project_page_html(template, parsed.meta, category, detail))
+
+
+def sitemap_pages(store: ContentStore) -> list[tuple[str, list[Path]]]:
+    """Every URL in the sitemap with the committed content files its page is rendered from."""
+    md = {c: [store.project_path(c, p["slug"]) for p in store.projects(c)] for c in ("art", "research")}
+    projects_json = store.content_dir / "projects.json"
+    about = [store.content_dir / "about" / name for name in ("bio.md", "talks.md", "media.md")]
+    pages = [
+        (f"{SITE_URL}/", [projects_json] + md["art"] + md["research"]),
+        (f"{SITE_URL}/about.html", about + md["research"]),
+        (f"{SITE_URL}/art.html", [projects_json] + md["art"]),
+        (f"{SITE_URL}/research.html", [projects_json] + md["research"]),
+    ]
+    for category in ("art", "research"):
+        for project, path in zip(store.projects(category), md[category]):
+            pages.append((project_url(category, project["slug"]), [path]))
+    return pages
+
+
+def commit_dates(repo: Path) -> dict[str, str] | None:
+    """Day (UTC) of the last commit touching each file under content/; today for files with uncommitted changes.
+
+    None outside a git checkout. Needs the full history (a shallow clone dates every file to its one commit).
+    """
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args], cwd=repo, capture_output=True, text=True, check=True
+        ).stdout
+
+    try:
+        log = git("log", "--format=%x00%ct", "--name-only", "--no-renames", "--", "content")
+        status = git("status", "--porcelain", "-z", "--no-renames", "--untracked-files=all", "--", "content")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    dates: dict[str, str] = {}
+    day = ""
+    for line in log.splitlines():
+        if line.startswith("\0"):
+            day = time.strftime("%Y-%m-%d", time.gmtime(int(line[1:])))
+        elif line and line not in dates:
+            dates[line] = day  # the log runs newest first
+    today = time.strftime("%Y-%m-%d", time.gmtime())
+    for entry in status.split("\0"):
+        if entry:
+            dates[entry[3:]] = today
+    return dates
+
+
+def build_sitemap(repo: Path, store: ContentStore) -> bool:
+    """Write sitemap.xml with the four pages and every project page.
+
+    A URL's lastmod is the last commit date of the content it is rendered from (see sitemap_pages), so the same
+    checkout always gives the same sitemap. Uncommitted edits count as today; outside git file mtimes are used.
+    """
+    dates = commit_dates(repo)
+    entries = []
+    for loc, sources in sitemap_pages(store):
+        days = []
+        for source in sources:
+            day = dates.get(source.relative_to(repo).as_posix()) if dates is not None else None
+            if day is None and source.exists():
+                day = time.strftime("%Y-%m-%d", time.gmtime(source.stat().st_mtime))
+            if day:
+                days.append(day)
+        if days:
+            entries.append(f"  <url>\n    <loc>{loc}</loc>\n    <lastmod>{max(days)}</lastmod>\n  </url>\n")
+    written = write_output(repo / SITEMAP, (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        f"{''.join(entries)}</urlset>\n"
+    ))
+    source = "commit dates" if dates is not None else "file dates (not a git checkout)"
+    print(f"  sitemap: {len(entries)} URLs, lastmod from {source}{unchanged_note(written)}")
+    return written
+
+
+BUILDERS = {
+    "index.html": build_index,
+    "art.html": build_art,
+    "research.html": build_research,
+    "about.html": build_about,
+    (SEARCH_DIR / SEARCH_INDEX).as_posix(): build_search,
+    SITEMAP: build_sitemap,
+}
+
+
+def output_kind(output: str) -> str:
+    """What a per-project output (one not in BUILDERS) is: "project page" or "detail fragment"."""
+    return "project page" if output.endswith(PROJECT_PAGE) else "detail fragment"
+
+
+def render_output(output: str, repo: Path, store: ContentStore) -> tuple[str, bool, list[str], dict[str, Any]]:
+    """Build one page, detail fragment or project page; return its progress output (so parallel builds still report in order),
+    whether the file was written, the inputs only known after rendering (images whose size went into it, the search
+    shards it wrote) and the image size cache entries it added (which a --jobs worker would otherwise keep to itself)."""
+    store.images.used.clear()
+    out = io.StringIO()
+    with redirect_stdout(out), stage(f"page {output}" if output in BUILDERS else f"page {output_kind(output)}"):
+        if output in BUILDERS:
+            written = BUILDERS[output](repo, store)
+        elif output.endswith(PROJECT_PAGE):
+            written = build_project_page(repo, store, output)
+        else:
+            written = build_detail(repo, store, output)
+    found = set(store.images.used)
+    if output in BUILDERS and BUILDERS[output] is build_search:
+        found.update(path.relative_to(repo).as_posix() for path in search_files(repo))
+    return out.getvalue(), written, sorted(found), store.image_sizes.take_new()
+
+
+_worker_store: ContentStore | None = None
+
+
+def init_render_worker(store: ContentStore) -> None:
+    """ProcessPoolExecutor initializer: each worker receives the store once instead of with every chunk of tasks."""
+    global _worker_store
+    _worker_store = store
+
+
+def render_in_worker(output: str, repo: Path) -> tuple[str, bool, list[str], dict[str, Any]]:
+    return render_output(output, repo, _worker_store)
+
+
+def page_inputs(repo: Path, content_dir: Path, art_list: list[str], research_list: list[str]) -> dict[str, list[Path]]:
+    """Dependency graph: every file each output is rendered from (outputs count as inputs, so pages are their own
+    template and deleted fragments get rebuilt)."""
+    build_script = Path(__file__).resolve()
+    manifest = content_dir / SRCSET_MANIFEST
+    project_template = repo / PROJECT_PAGE_TEMPLATE
+    shared = [build_script, content_dir / "projects.json", manifest]
+    art_md = [content_dir / "art" / slug / "index.md" for slug in art_list]
+    research_md = [content_dir / "research" / slug / "index.md" for slug in research_list]
+    about_md = [content_dir / "about" / name for name in ("bio.md", "talks.md", "media.md")]
+    shards = {
+        category: [
+            content_dir / category / PROJECT_SHARD.format(n=n)
+            for n in range(shard_count(sum(1 for md in mds if md.exists())))
+        ]
+        for category, mds in (("art", art_md), ("research", research_md))
+    }
+    graph = {
+        "index.html": shared + art_md + research_md + [repo / "index.html"],
+        "art.html": shared + art_md + shards["art"] + [repo / "art.html"],
+        "research.html": shared + research_md + shards["research"] + [repo / "research.html"],
+        "about.html": shared + research_md + about_md + [repo / "about.html"],
+        # Shards that exist now are inputs too, so deleting one rebuilds the index.
+        (SEARCH_DIR / SEARCH_INDEX).as_posix(): [build_script, content_dir / "projects.json"] + art_md + research_md
+        + [content_dir / "about" / "talks.md", repo / SEARCH_DIR / SEARCH_INDEX] + search_files(repo),
+        SITEMAP: [build_script, content_dir / "projects.json"] + art_md + research_md + about_md + [repo / SITEMAP],
+    }
+    # The same Path objects are reused across outputs: their hashes are cached, which the dependency check relies on.
+    for category, slugs, mds in (("art", art_list, art_md), ("research", research_list, research_md)):
+        for slug, md in zip(slugs, mds):
+            if md.exists():
+                output = detail_output(category, slug)
+                graph[output] = [build_script, md, manifest, repo / output]
+                page = project_page_output(category, slug)
+                graph[page] = [build_script, md, manifest, project_template, repo / page]
+    return graph
+
+
+def load_build_state(repo: Path) -> dict[str, Any]:
+    """Read the dependency state of the previous build; empty state if missing or from another version."""
+    path = repo / BUILD_STATE_PATH
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    if state.get("version") != BUILD_STATE_VERSION:
+        state = {"version": BUILD_STATE_VERSION, "files": {}, "pages": {}}
+    return state
+
+
+def save_build_state(repo: Path, state: dict[str, Any]) -> None:
+    path = repo / BUILD_STATE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Compact on purpose: with indent json falls back to its pure-Python encoder, slow for thousands of pages.
+    write_output(path, json.dumps(state, separators=(",", ":"), sort_keys=True))
+
+
+def file_fingerprint(path: Path | str, repo: Path, state: dict[str, Any], rel: str | None = None) -> str:
+    """Content hash of path ("" if missing). Reuses the recorded hash while size and mtime are unchanged."""
+    rel = rel or Path(path).relative_to(repo).as_posix()
+    try:
+        st = os.stat(path)
+    except OSError:
+        state["files"].pop(rel, None)
+        return ""
+    known = state["files"].get(rel)
+    if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+        return known[2]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    state["files"][rel] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+
+class Fingerprints:
+    """file_fingerprint for the inputs of many outputs, each distinct file stat'ed at most once.
+
+    Most pages list the same inputs (build.py, projects.json, templates), so one table per build keeps the
+    dependency check linear in the number of files instead of outputs x inputs. Make a new one after writing.
+    """
+
+    def __init__(self, repo: Path, state: dict[str, Any]) -> None:
+        self.repo = repo
+        self.root = str(repo)
+        self.state = state
+        self._rels: dict[Path, str] = {}
+        self._digests: dict[str, str] = {}
+
+    def rel(self, path: Path) -> str:
+        rel = self._rels.get(path)
+        if rel is None:
+            rel = self._rels[path] = path.relative_to(self.repo).as_posix()
+        return rel
+
+    def digest(self, rel: str) -> str:
+        digest = self._digests.get(rel)
+        if digest is None:
+            digest = self._digests[rel] = file_fingerprint(os.path.join(self.root, rel), self.repo, self.state, rel)
+        return digest
+
+    def page(self, inputs: list[Path], extra: Iterable[str] = ()) -> dict[str, str]:
+        """{rel: hash} of inputs plus the extra rel paths."""
+        fingerprints = {rel: self.digest(rel) for rel in map(self.rel, inputs)}
+        for rel in extra:
+            if rel not in fingerprints:
+                fingerprints[rel] = self.digest(rel)
+        return fingerprints
+
+
+def stale_outputs(graph: dict[str, list[Path]], repo: Path, state: dict[str, Any]) -> list[str]:
+    """Outputs whose inputs (or own contents) differ from what the previous build recorded.
+
+    Inputs only known after rendering (images) were recorded with the page and are checked as well.
+    """
+    fingerprints = Fingerprints(repo, state)
+    stale = []
+    for output, inputs in graph.items():
+        recorded = state["pages"].get(output)
+        if recorded is None or recorded != fingerprints.page(inputs, recorded):
+            stale.append(output)
+    return stale
+
+
+def changed_outputs(graph: dict[str, list[Path]], repo: Path, state: dict[str, Any], changed: set[Path]) -> list[str]:
+    """stale_outputs for a known set of changed files (from dev.py's watcher): only those are hashed again.
+
+    Returns the outputs that were never built or list a file whose content really changed among their inputs.
+    """
+    fingerprints = Fingerprints(repo, state)
+    listed = {output: set(map(fingerprints.rel, inputs)) for output, inputs in graph.items()}
+    all_inputs = set().union(*listed.values())
+    edited = set()
+    for path in changed:
+        rel = path.relative_to(repo).as_posix()
+        before = state["files"].get(rel)
+        if before is None and rel not in all_inputs:
+            continue  # a new file nothing reads (yet)
+        if file_fingerprint(path, repo, state, rel) != (before[2] if before else ""):
+            edited.add(rel)
+    stale = []
+    for output in graph:
+        recorded = state["pages"].get(output)
+        if recorded is None or edited & (recorded.keys() | listed[output]):
+            stale.append(output)
+    return stale
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Pre-render index, art, research and about pages from content/.",
+        epilog="Only outputs whose inputs changed are rendered again; dependency state, parse cache and image sizes "
+        "are kept in .cache/build/.",
     )
-    # Media Coverage: replace section content (end pattern = section-content + about-section closers)
-    html = re.sub(
-        r'(<div class="about-section">\s*<h2>Media Coverage</h2>\s*<div class="section-content">)[\s\S]*?(                                </div>\n                            </div>\n                    </div>)',
-        rf"\1\n{media_html}\n\2",
-        html,
-        count=1,
+    parser.add_argument("--force", action="store_true", help="Rebuild every page even if its inputs are unchanged.")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="Parse content and render pages in N worker processes (0 = one per CPU). Output is identical to -j 1.",
     )
-    about_path.write_text(html, encoding="utf-8")
-    print("  about: bio + publications + talks + media")
+    parser.add_argument(
+        "--dist", type=Path, nargs="?", const=DIST_DIR, metavar="DIR",
+        help=f"After building, export the deployable site to DIR (default: {DIST_DIR}): HTML/CSS/JS minified, CSS/JS "
+        f"also under content-hashed names ({ASSET_MANIFEST}), other files hard-linked, .gz (and .br with the brotli "
+        "module) next to text files. Unchanged files are skipped.",
+    )
+    parser.add_argument(
+        "--no-precompress", dest="precompress", action="store_false",
+        help="With --dist: skip the .gz/.br files (for hosts that compress on the fly, like GitHub Pages).",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print wall/CPU time and call counts per stage.")
+    parser.add_argument("--trace", type=Path, metavar="FILE", help="With profiling: write a Chrome trace-event JSON.")
+    parser.add_argument("--cprofile", type=Path, metavar="FILE", help="With profiling: write a cProfile (pstats) dump.")
+    return parser.parse_args()
 
 
 def main() -> None:
+    global PROFILER
+    args = parse_args()
     repo = Path(__file__).resolve().parent.parent
-    content_dir = repo / "content"
-    with open(content_dir / "projects.json", encoding="utf-8") as f:
-        config = json.load(f)
-    art_list = config.get("art") or []
-    research_list = config.get("research") or []
-
-    print("Pre-rendering site...")
-    build_index(repo, content_dir, art_list, research_list)
-    build_art(repo, content_dir, art_list)
-    build_research(repo, content_dir, research_list)
-    build_about(repo, content_dir, research_list)
-    print("Done.")
+    if not (args.profile or args.trace or args.cprofile):
+        build_site(repo, args.force, args.jobs)
+        if args.dist:
+            export_dist(repo, repo / args.dist, args.precompress)
+        return
+    if args.jobs != 1:
+        print("Profiling runs serially so every stage is measured in-process (ignoring --jobs).")
+    PROFILER = Profiler()
+    profile = cProfile.Profile() if args.cprofile else None
+    if profile:
+        profile.enable()
+    with PROFILER.stage("total"):
+        build_site(repo, args.force, 1)
+        if args.dist:
+            export_dist(repo, repo / args.dist, args.precompress)
+    if profile:
+        profile.disable()
+        profile.dump_stats(args.cprofile)
+        print(f"cProfile dump: {args.cprofile}")
+    print("Profile:")
+    print(PROFILER.summary())
+    if args.trace:
+        PROFILER.write_trace(args.trace)
+        print(f"Chrome trace: {args.trace}")
+
+
+class BuildSession:
+    """Build state that can outlive one build: dependency fingerprints, parse and image size caches, parsed content.
+
+    build_site uses a session for a single build; dev.py keeps one alive and calls build() on every change,
+    so only files that changed since the previous build are read and parsed again.
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = repo
+        self.content_dir = repo / "content"
+        self.state = load_build_state(repo)
+        self.cache = ParseCache(repo)
+        self.image_sizes = ImageSizes(repo)
+        self.store: ContentStore | None = None
+        self._config: dict[str, Any] | None = None
+        self._seen: dict[str, str] = {}  # input path -> content hash at the previous build of this session
+        self.written: list[str] = []  # outputs the last build() actually changed (dev.py reloads the pages showing them)
+
+    def _changed_inputs(self) -> set[Path]:
+        changed = {rel for rel, known in self.state["files"].items() if self._seen.get(rel) != known[2]}
+        changed |= self._seen.keys() - self.state["files"].keys()
+        self._seen = {rel: known[2] for rel, known in self.state["files"].items()}
+        return {self.repo / rel for rel in changed}
+
+    def pending(self, paths: set[Path]) -> set[Path]:
+        """Of the paths a file watcher reported, the ones a build has to look at.
+
+        That is files whose size or mtime differs from what the last build recorded and new text files. The build's
+        own writes (recorded right after writing) drop out, and so do binary files no page depends on.
+        """
+        pending = set()
+        for path in paths:
+            try:
+                rel = path.relative_to(self.repo).as_posix()
+            except ValueError:
+                continue
+            known = self.state["files"].get(rel)
+            try:
+                st = path.stat()
+            except OSError:
+                if known:
+                    pending.add(path)
+                continue
+            if known is None:
+                if path.is_file() and path.suffix.lower() in WATCH_TEXT_SUFFIXES:
+                    pending.add(path)
+            elif known[0] != st.st_size or known[1] != st.st_mtime_ns:
+                pending.add(path)
+        return pending
+
+    def build(self, force: bool = False, jobs: int = 1, changed: set[Path] | None = None) -> int:
+        """Render stale outputs; return the number of files written.
+
+        changed: the files edited since the last build, if known (see pending); then only those are checked.
+        """
+        with open(self.content_dir / "projects.json", encoding="utf-8") as f:
+            config = json.load(f)
+        art_list = config.get("art") or []
+        research_list = config.get("research") or []
+
+        with stage("dependency check"):
+            graph = page_inputs(self.repo, self.content_dir, art_list, research_list)
+            state = self.state
+            if force:
+                stale = list(graph)
+            elif changed is not None:
+                stale = changed_outputs(graph, self.repo, state, changed)
+            else:
+                stale = stale_outputs(graph, self.repo, state)
+
+        if self.store is None or config != self._config or force:
+            self.store = ContentStore(self.content_dir, art_list, research_list, self.cache, self.image_sizes)
+            self._config = config
+        else:
+            self.store.invalidate(self._changed_inputs())
+        store = self.store
+        jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        print("Pre-rendering site...")
+        if stale and not (self.content_dir / SRCSET_MANIFEST).exists():
+            print(f"  no content/{SRCSET_MANIFEST} (scripts/responsive_images.py writes it): images get width/height only, no srcset or placeholder")
+        if jobs > 1 and stale:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                store.preload(pool, jobs)
+            # A second pool, so the workers start from the store with everything parsed above.
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_render_worker, initargs=(store,)) as pool:
+                chunksize = max(1, len(stale) // (jobs * 4))
+                results = dict(zip(stale, pool.map(render_in_worker, stale, [self.repo] * len(stale), chunksize=chunksize)))
+        else:
+            results = {output: render_output(output, self.repo, store) for output in stale}
+        fingerprints = Fingerprints(self.repo, state)
+        for output in graph:
+            if output in stale:
+                print(results[output][0], end="")
+                self.image_sizes.merge(results[output][3])
+                # Record inputs after writing so the freshly rendered output counts as up to date.
+                with stage("record fingerprints"):
+                    state["pages"][output] = fingerprints.page(graph[output], results[output][2])
+            elif output in BUILDERS:
+                print(f"  {'search' if output.startswith(SEARCH_DIR.as_posix()) else Path(output).stem}: up to date, skipped")
+        for kind, label in (("detail fragment", "details"), ("project page", "project pages")):
+            outputs = [output for output in graph if output not in BUILDERS and output_kind(output) == kind]
+            rendered = [output for output in outputs if output in stale]
+            unchanged = sum(1 for output in rendered if not results[output][1])
+            print(f"  {label}: {len(rendered)} rendered ({unchanged} unchanged), {len(outputs) - len(rendered)} up to date")
+        save_build_state(self.repo, state)
+        self.cache.save()
+        self.image_sizes.save()
+        # Outputs just written count as seen, so the next build does not treat them as edited inputs.
+        self._changed_inputs()
+        if self.cache.hits or self.cache.misses:
+            print(f"  parse cache: {self.cache.hits} hit(s), {self.cache.misses} parsed")
+            self.cache.hits = self.cache.misses = 0
+        self.written = [output for output in stale if results[output][1]]
+        print(f"Done. {len(self.written)} file(s) written.")
+        return len(self.written)
+
+
+def build_site(repo: Path, force: bool, jobs: int) -> None:
+    BuildSession(repo).build(force, jobs)
+
+
+def dist_sources(repo: Path) -> Iterator[Path]:
+    """Repo files that belong in the deployed site."""
+    for name in DIST_ROOT_FILES:
+        if (repo / name).is_file():
+            yield repo / name
+    for top in DIST_DIRS:
+        for root, dirs, files in os.walk(repo / top):
+            dirs[:] = sorted(d for d in dirs if d not in DIST_SKIP_DIRS and not d.startswith("."))
+            for name in sorted(files):
+                if not name.startswith("."):
+                    yield Path(root) / name
+
+
+def link_output(src: Path, dst: Path) -> bool:
+    """Hard-link src to dst (copy across filesystems) unless dst already is that file; return whether it changed."""
+    try:
+        st, dst_st = src.stat(), dst.stat()
+        if os.path.samestat(st, dst_st) or (st.st_size, st.st_mtime_ns) == (dst_st.st_size, dst_st.st_mtime_ns):
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return True
+
+
+def compressed_variants(path: Path) -> dict[str, Callable[[bytes], bytes]]:
+    """Encodings written next to path by precompress, as {file suffix: compress function}."""
+    variants: dict[str, Callable[[bytes], bytes]] = {".gz": lambda data: gzip.compress(data, 9, mtime=0)}
+    if HAS_BROTLI:
+        variants[".br"] = lambda data: brotli.compress(data, quality=11)
+    return variants
+
+
+def precompress(path: Path, sizes: dict[str, int], skipped: dict[str, list[int]]) -> list[Path]:
+    """Write path.gz / path.br unless they are up to date; return the variants that should exist.
+
+    A variant carries its source's mtime, so an equal mtime means it is current. Variants that are not
+    smaller than the source are not kept; skipped records them by variant path with the source's
+    [size, mtime], so they are not compressed again until the source changes. sizes accumulates bytes
+    per encoding ("" = uncompressed).
+    """
+    if path.suffix.lower() not in PRECOMPRESS_SUFFIXES:
+        return []
+    st = path.stat()
+    if st.st_size < PRECOMPRESS_MIN_BYTES:
+        return []
+    sizes[""] = sizes.get("", 0) + st.st_size
+    data = None
+    kept = []
+    for suffix, compress in compressed_variants(path).items():
+        out = path.with_name(path.name + suffix)
+        try:
+            out_st = out.stat()
+            if out_st.st_mtime_ns == st.st_mtime_ns:
+                sizes[suffix] = sizes.get(suffix, 0) + out_st.st_size
+                kept.append(out)
+                continue
+        except FileNotFoundError:
+            pass
+        if skipped.get(str(out)) == [st.st_size, st.st_mtime_ns]:
+            out.unlink(missing_ok=True)
+            continue
+        if data is None:
+            data = path.read_bytes()
+        packed = compress(data)
+        if len(packed) >= len(data):
+            out.unlink(missing_ok=True)
+            skipped[str(out)] = [st.st_size, st.st_mtime_ns]
+            continue
+        skipped.pop(str(out), None)
+        tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(packed)
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp, out)
+        finally:
+            tmp.unlink(missing_ok=True)
+        sizes[suffix] = sizes.get(suffix, 0) + len(packed)
+        kept.append(out)
+    return kept
+
+
+def fingerprinted_name(rel: str, text: str) -> str:
+    """rel with a hash of text before the extension: css/style.css -> css/style.<hash>.css."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:ASSET_HASH_LENGTH]
+    stem, _, ext = rel.rpartition(".")
+    return f"{stem}.{digest}.{ext}"
+
+
+def custom_js_assets(repo: Path) -> set[str]:
+    """Repo-relative paths of the per-project custom_js files, as listed in the project shards."""
+    found = set()
+    for shard in sorted((repo / "content").glob(f"*/{PROJECT_SHARD.format(n='*')}")):
+        for record in json.loads(shard.read_text(encoding="utf-8")):
+            if record.get("custom_js"):
+                found.add(f"content/{shard.parent.name}/{record['slug']}/{record['custom_js']}")
+    return found
+
+
+_ASSET_REF_RE = re.compile(r"""(\b(?:href|src)=)(["']?)([^"'\s>]+)\2""", re.IGNORECASE)
+
+
+def rewrite_asset_refs(html: str, assets: dict[str, str]) -> str:
+    """Point href/src attributes at the fingerprinted copies (pages and fragments both resolve from the site root)."""
+    return _ASSET_REF_RE.sub(lambda m: f"{m.group(1)}{m.group(2)}{assets.get(m.group(3), m.group(3))}{m.group(2)}", html)
+
+
+def rewrite_shard(text: str, category: str, assets: dict[str, str]) -> str | None:
+    """Shard JSON with custom_js pointing at the fingerprinted files, or None if nothing changes."""
+    records = json.loads(text)
+    changed = False
+    for record in records:
+        prefix = f"content/{category}/{record['slug']}/"
+        hashed = assets.get(prefix + record["custom_js"]) if record.get("custom_js") else None
+        if hashed:
+            record["custom_js"] = hashed.removeprefix(prefix)
+            changed = True
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")) if changed else None
+
+
+@profiled("export dist")
+def export_dist(repo: Path, dist: Path, precompressed: bool = True) -> None:
+    """Mirror the site into dist: HTML, CSS and JS minified, everything else hard-linked, text files precompressed
+    (unless precompressed is False); stale files removed.
+
+    The pages in the repo stay readable (and keep their slot markers), so the minified copies live only in dist.
+    CSS/JS assets are also written under a content-hashed name that the exported pages and project shards use,
+    so a deploy never mixes cached and new assets and the hashed files can be cached indefinitely.
+    """
+    print(f"Exporting {dist.relative_to(repo) if dist.is_relative_to(repo) else dist}...")
+    sources = list(dist_sources(repo))
+    before = after = minified = linked = 0
+    texts: dict[str, str] = {}  # repo-relative path -> minified text
+    for src in sources:
+        minifier = MINIFIERS.get(src.suffix.lower())
+        if minifier:
+            text = src.read_text(encoding="utf-8")
+            texts[src.relative_to(repo).as_posix()] = out = minifier(text)
+            before += len(text.encode("utf-8"))
+            after += len(out.encode("utf-8"))
+    fingerprint = {rel for rel in texts if rel.startswith(("css/", "js/"))} | custom_js_assets(repo)
+    assets = {rel: fingerprinted_name(rel, texts[rel]) for rel in sorted(fingerprint) if rel in texts}
+
+    expected: set[Path] = set()
+    sizes: dict[str, int] = {}
+    skips_path = repo / PRECOMPRESS_SKIPS_PATH
+    try:
+        skips = json.loads(skips_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        skips = {}
+    skipped: dict[str, list[int]] = skips.get("skipped", {}) if skips.get("version") == PRECOMPRESS_SKIPS_VERSION else {}
+    shard_name = re.compile(PROJECT_SHARD.format(n=r"\d+").replace(".", r"\."))
+    for src in sources:
+        rel = src.relative_to(repo).as_posix()
+        dst = dist / rel
+        outputs = [dst]
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if rel in texts:
+            text = rewrite_asset_refs(texts[rel], assets) if src.suffix.lower() == ".html" else texts[rel]
+            written = write_output(dst, text)
+            if rel in assets:
+                outputs.append(dist / assets[rel])
+                written = write_output(outputs[-1], text) or written
+            minified += written
+        elif shard_name.fullmatch(src.name) and (text := rewrite_shard(src.read_text(encoding="utf-8"), src.parent.name, assets)):
+            write_output(dst, text)
+        else:
+            linked += link_output(src, dst)
+        for output in outputs:
+            expected.add(output)
+            if precompressed:
+                expected.update(precompress(output, sizes, skipped))
+    if precompressed:
+        exported = {str(path) for path in expected}
+        skipped = {out: known for out, known in skipped.items() if out.rpartition(".")[0] in exported}
+        skips_path.parent.mkdir(parents=True, exist_ok=True)
+        write_output(skips_path, json.dumps({"version": PRECOMPRESS_SKIPS_VERSION, "skipped": skipped}, indent=1, sort_keys=True))
+    manifest = dist / ASSET_MANIFEST
+    write_output(manifest, json.dumps(assets, indent=1, sort_keys=True) + "\n")
+    expected.add(manifest)
+
+    removed = 0
+    for root, _, files in os.walk(dist, topdown=False):
+        for name in files:
+            path = Path(root) / name
+            if path not in expected:
+                path.unlink()
+                removed += 1
+        if root != str(dist) and not os.listdir(root):
+            os.rmdir(root)
+    saved = 100 * (before - after) / before if before else 0
+    print(f"  minified HTML/CSS/JS: {before / 1024:.1f} KB -> {after / 1024:.1f} KB (-{saved:.0f}%), {minified} written")
+    print(f"  fingerprinted {len(assets)} asset(s), see {ASSET_MANIFEST}")
+    if sizes:
+        packed = ", ".join(f"{suffix[1:]} {sizes.get(suffix, 0) / 1024:.1f} KB" for suffix in compressed_variants(dist))
+        print(f"  precompressed text: {sizes[''] / 1024:.1f} KB -> {packed}" + ("" if HAS_BROTLI else " (no brotli module, .br skipped)"))
+    print(f"  {len(expected)} file(s) in dist, {linked} other file(s) linked, {removed} stale removed")
 
 
 if __name__ == "__main__":
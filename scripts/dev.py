@@ -3,92 +3,1056 @@
 Local dev: serve the site and rebuild when content or build script changes.
 Run from repo root: python3 scripts/dev.py
 Then open http://localhost:8000 and refresh after editing markdown.
+
+With --dist, serves the minified, precompressed export (build.py --dist) instead, re-exported after
+every rebuild, so transfer sizes match what a host serving the .gz/.br files would send.
+
+Served pages get a small live-reload client: after a rebuild, pages showing a changed file reload themselves
+(stylesheet-only changes are swapped in place), pushed over Server-Sent Events.
+
+Request timings, response sizes, cache hits, build durations and watcher events are at /__dev/stats.
 """
 
+import argparse
+import bisect
+import ctypes
+import ctypes.util
+import email.utils
+import functools
+import gzip
+import hashlib
+import heapq
 import http.server
+import importlib.util
+import io
+import json
 import os
-import subprocess
+import queue
+import re
+import select
+import stat
+import struct
 import sys
 import threading
 import time
+import traceback
+import urllib.parse
+from collections import OrderedDict
+from html import escape
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
 
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
-def build() -> bool:
-    """Run build.py. Return True if successful."""
-    root = repo_root()
-    result = subprocess.run(
-        [sys.executable, str(root / "scripts" / "build.py")],
-        cwd=root,
-        capture_output=True,
-        text=True,
+def file_mtime_ns(path: Path) -> int:
+    """mtime of path, -1 if it is gone."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+class BuildService:
+    """Runs build.py in this process and keeps its BuildSession (parsed content, fingerprints) between builds.
+
+    build.py is re-imported only when it or one of the scripts/ modules it pulls in (minify, responsive_images)
+    changes; those are re-imported with it. A failed import is reported and retried after the next edit.
+    """
+
+    def __init__(self, root: Path, dist: Path | None = None) -> None:
+        self.root = root
+        self.dist = dist
+        self.script = root / "scripts" / "build.py"
+        self.mtimes: dict[Path, int] = {self.script: -1}  # build.py and its local imports at the last load
+        self.module: ModuleType | None = None
+        self.session: Any = None
+        self.failed = False
+
+    def local_modules(self) -> dict[str, Path]:
+        """Modules imported from scripts/ (build and what it uses), by module name."""
+        found = {}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if name != "__main__" and path and Path(path).parent == self.script.parent:
+                found[name] = Path(path)
+        return found
+
+    @property
+    def sources(self) -> set[Path]:
+        """The files whose edits reload build.py."""
+        return self.mtimes.keys() | set(self.local_modules().values())
+
+    def _load(self) -> None:
+        for path in self.local_modules().values():
+            # Imported since the last load (responsive_images on the first resize), so already current.
+            self.mtimes.setdefault(path, file_mtime_ns(path))
+        if all(file_mtime_ns(path) == mtime_ns for path, mtime_ns in self.mtimes.items()):
+            return
+        tracked = self.sources
+        self.mtimes = {path: file_mtime_ns(path) for path in tracked}
+        self.module = self.session = None
+        for name in self.local_modules():
+            del sys.modules[name]  # re-imported fresh below (or on first use) rather than reused
+        spec = importlib.util.spec_from_file_location("build", self.script)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["build"] = module  # dataclasses look their module up while the class is created
+        spec.loader.exec_module(module)
+        self.mtimes.update({path: file_mtime_ns(path) for path in self.local_modules().values() if path not in tracked})
+        self.module = module
+        self.session = module.BuildSession(self.root)
+        print("[dev] loaded scripts/build.py")
+
+    def pending(self, paths: set[Path]) -> set[Path]:
+        """The reported paths a rebuild has to look at (all of them until build.py is loaded or after it changed)."""
+        if self.session is None or paths & self.sources:
+            return paths
+        return self.session.pending(paths)
+
+    def build(self, changed: set[Path] | None = None) -> bool:
+        """Rebuild what changed since the last call (only the changed files if given). Return True if successful.
+
+        After a failed build the next one checks every input again, whatever changed.
+        """
+        try:
+            self._load()
+            if self.session is None:
+                return False
+            self.session.build(changed=None if self.failed else changed)
+            if self.dist:
+                self.module.export_dist(self.root, self.dist)
+        except SystemExit as e:
+            print(e, file=sys.stderr)
+            self.failed = True
+            return False
+        except Exception:
+            traceback.print_exc()
+            # Start over with fresh state; the next build re-reads everything.
+            self.session = self.module.BuildSession(self.root) if self.module else None
+            self.failed = True
+            return False
+        self.failed = False
+        return True
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings a client accepts per its Accept-Encoding header (q=0 means refused)."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip().removeprefix("q=") if params.strip().startswith("q=") else "1"
+        try:
+            if float(q) > 0:
+                accepted.add(coding.strip().lower())
+        except ValueError:
+            pass
+    return accepted
+
+
+LIVE_EVENTS = "/__dev/events"
+LIVE_SCRIPT = "/__dev/live.js"
+LIVE_SCRIPT_TAG = f'<script src="{LIVE_SCRIPT}"></script>'
+# Reload when the page itself, a site script or a file of the open project changed; swap changed stylesheets.
+LIVE_CLIENT = """(function () {
+    var source = new EventSource('%s?page=' + encodeURIComponent(location.pathname));
+    var serverId = null;
+    source.addEventListener('hello', function (event) {
+        // dev.py was restarted while the page was open: it may be out of date.
+        if (serverId !== null && serverId !== event.data) location.reload();
+        serverId = event.data;
+    });
+    source.addEventListener('change', function (event) {
+        var data = JSON.parse(event.data);
+        var css = data.css || {};
+        if (data.changed.every(function (file) { return file in css; })) {
+            document.querySelectorAll('link[rel="stylesheet"]').forEach(function (link) {
+                var file = new URL(link.href).pathname.slice(1).replace(/\\.[0-9a-f]{10}(\\.css)$/, '$1');
+                if (!css[file]) return;
+                var next = link.cloneNode();
+                next.href = '/' + css[file];
+                next.onload = function () { link.remove(); };
+                link.after(next);
+            });
+            return;
+        }
+        var detail = document.getElementById('project-detail');
+        var slug = location.hash ? decodeURIComponent(location.hash.slice(1)) : detail && detail.dataset.projectPage;
+        var open = slug && window.projectBasePath ? window.projectBasePath + '/' + slug + '/' : null;
+        if (data.changed.some(function (file) {
+            return file === data.page || file.indexOf('js/') === 0 || (open && file.indexOf(open) === 0);
+        })) {
+            location.reload();
+        }
+    });
+})();
+""" % LIVE_EVENTS
+
+
+def page_file(url_path: str) -> str:
+    """Repo-relative HTML file served for a URL path ("/" -> "index.html", "/content/art/x/" -> "content/art/x/index.html")."""
+    rel = urllib.parse.unquote(url_path).lstrip("/")
+    return rel + "index.html" if not rel or rel.endswith("/") else rel
+
+
+def relevant_changes(page: str, changed: set[str]) -> list[str]:
+    """The changed files (repo-relative) the page may show: itself, stylesheets and scripts, and on art/research
+    pages (grid or project page) the files of that category: detail fragments, shards, media, custom_js."""
+    parts = page.split("/")
+    category = page.removesuffix(".html") if page in ("art.html", "research.html") else None
+    if len(parts) == 4 and parts[0] == "content":
+        category = parts[1]
+    return sorted(
+        rel for rel in changed
+        if rel == page or rel.startswith(("css/", "js/")) or (category and rel.startswith(f"content/{category}/"))
     )
-    if result.returncode != 0:
-        print(result.stderr or result.stdout, file=sys.stderr)
+
+
+class LiveReload:
+    """Server-Sent Events hub: every open page subscribes with its path and gets told which changed files it shows."""
+
+    def __init__(self, dist: Path | None) -> None:
+        self.dist = dist
+        self.server_id = str(time.time_ns())
+        self.lock = threading.Lock()
+        self.clients: list[tuple[str, queue.Queue]] = []
+
+    def subscribe(self, page: str) -> queue.Queue:
+        q: queue.Queue = queue.Queue()
+        with self.lock:
+            self.clients.append((page, q))
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self.lock:
+            self.clients = [client for client in self.clients if client[1] is not q]
+
+    def stylesheet_url(self, rel: str) -> str:
+        """Where the page should load a changed stylesheet from: its new fingerprinted copy in dist, else a fresh URL."""
+        if self.dist:
+            try:
+                return json.loads((self.dist / "asset-manifest.json").read_text(encoding="utf-8")).get(rel, rel)
+            except (OSError, ValueError):
+                return rel
+        return f"{rel}?v={time.time_ns()}"
+
+    def notify(self, changed: set[str]) -> int:
+        """Push the changed files to the pages that show one of them; return how many pages were told."""
+        css = {rel: self.stylesheet_url(rel) for rel in changed if rel.startswith("css/") and rel.endswith(".css")}
+        with self.lock:
+            clients = list(self.clients)
+        told = 0
+        for page, q in clients:
+            files = relevant_changes(page, changed)
+            if files:
+                q.put(json.dumps({"page": page, "changed": files, "css": {rel: css[rel] for rel in files if rel in css}}))
+                told += 1
+        return told
+
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """First and last byte of a single-range Range header; None (send everything) for malformed or multiple ranges.
+
+    Raises ValueError if the range lies outside the file (416).
+    """
+    match = _RANGE_RE.fullmatch(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:  # suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+class StatCache:
+    """os.stat results of served paths, kept until clear() (on every watched change) or for at most TTL seconds,
+    so loading a page with dozens of images does not stat every file (and its .br/.gz siblings) on each request."""
+
+    TTL = 2.0
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: dict[Path, tuple[float, os.stat_result | None]] = {}
+
+    def stat(self, path: Path) -> os.stat_result | None:
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry and now - entry[0] < self.TTL:
+            return entry[1]
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        with self.lock:
+            self.entries[path] = (now, st)
+        return st
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+class MediaCache:
+    """Resized copies of content images for ?w=<width>&fmt=<webp|jpeg|png> requests.
+
+    Made with responsive_images.save_variant (the code that writes the srcset ladder) and kept in folder under
+    <source hash>-<width>.<ext>, so an edited image never hits an old copy. Beyond max_bytes the least recently
+    served copies are deleted; recency survives restarts through the files' mtimes.
+    """
+
+    MAX_WIDTH = 4096
+    SUFFIXES = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+
+    def __init__(self, folder: Path, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.digests: dict[tuple[Path, int, int], str] = {}  # (source, size, mtime_ns) -> content hash
+        self.busy: dict[str, threading.Lock] = {}  # one resize per output at a time
+        folder.mkdir(parents=True, exist_ok=True)
+        files = sorted((p.stat().st_mtime_ns, p.name, p.stat().st_size) for p in folder.iterdir() if not p.name.startswith("."))
+        self.entries: OrderedDict[str, int] = OrderedDict((name, size) for _, name, size in files)
+        self.total = sum(self.entries.values())
+
+    def _digest(self, source: Path, st: os.stat_result) -> str:
+        key = (source, st.st_size, st.st_mtime_ns)
+        with self.lock:
+            digest = self.digests.get(key)
+        if digest is None:
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()[:16]
+            with self.lock:
+                self.digests[key] = digest
+        return digest
+
+    def get(self, source: Path, st: os.stat_result, width: int | None, fmt: str | None) -> tuple[Path, bool]:
+        """The resized copy of source (made now if needed) and whether it came from the cache."""
+        import responsive_images  # needs Pillow; only loaded once a resize is asked for
+
+        fmt = fmt or responsive_images.FORMATS[source.suffix.lower()]
+        name = f"{self._digest(source, st)}-{width or 'full'}{self.SUFFIXES[fmt]}"
+        out = self.folder / name
+        with self.lock:
+            busy = self.busy.setdefault(name, threading.Lock())
+        with busy:
+            with self.lock:
+                hit = name in self.entries
+                if hit:
+                    self.entries.move_to_end(name)
+            if hit and out.exists():
+                os.utime(out)
+                return out, True
+            tmp = out.with_name(f".{name}.{threading.get_ident()}.tmp")
+            try:
+                with Image.open(source) as img:
+                    img = ImageOps.exif_transpose(img)
+                    responsive_images.save_variant(img, min(width or img.width, img.width), tmp, fmt)
+                os.replace(tmp, out)
+            finally:
+                tmp.unlink(missing_ok=True)
+            with self.lock:
+                self.total += out.stat().st_size - self.entries.pop(name, 0)
+                self.entries[name] = out.stat().st_size
+                while self.total > self.max_bytes and len(self.entries) > 1:
+                    old, size = self.entries.popitem(last=False)
+                    (self.folder / old).unlink(missing_ok=True)
+                    self.total -= size
+        return out, False
+
+
+STATS_PATH = "/__dev/stats"
+
+
+class Histogram:
+    """Counts per fixed bucket (values up to each bound, plus one overflow bucket), so memory stays constant
+    however long the server runs. Percentiles are read off the buckets, i.e. rounded up to a bound."""
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= q * self.count:
+                return min(bound, round(self.max, 2))
+        return round(self.max, 2)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": round(self.max, 2),
+            # [upper bound, count]; null is the overflow bucket
+            "buckets": [[bound, n] for bound, n in zip((*self.bounds, None), self.counts)],
+        }
+
+
+class DevMetrics:
+    """What the dev server did since it started: requests (latency, bytes, status, cache hits), builds and
+    watcher events. Everything is a counter or a Histogram; served as JSON or HTML at STATS_PATH."""
+
+    LATENCY_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+    SIZE_BYTES = tuple(1024 * 4 ** i for i in range(10))  # 1 KiB .. 256 MiB
+    BUILD_MS = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+    TYPES = {
+        ".html": "html", ".css": "css", ".js": "js", ".json": "json", ".md": "markdown",
+        ".jpg": "image", ".jpeg": "image", ".png": "image", ".webp": "image", ".gif": "image", ".svg": "image",
+        ".mp4": "video", ".webm": "video", ".mov": "video", ".pdf": "pdf",
+    }
+    TOP = 10
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.latency = Histogram(self.LATENCY_MS)
+        self.sizes = Histogram(self.SIZE_BYTES)
+        self.status: dict[int, int] = {}
+        self.types: dict[str, list[int]] = {}  # type -> [requests, bytes]
+        self.cache: dict[str, int] = {}
+        self.slowest: list[tuple[float, str]] = []  # min-heaps of the TOP largest values
+        self.heaviest: list[tuple[int, str]] = []
+        self.builds = Histogram(self.BUILD_MS)
+        self.build_failures = 0
+        self.outputs_written = 0
+        self.last_build: dict[str, Any] | None = None
+        self.watcher = {"batches": 0, "paths": 0, "relevant": 0, "full_rescans": 0}
+        self.notified = 0
+
+    def _keep_top(self, heap: list, item: tuple) -> None:
+        """Keep item (value, path) if it is among the TOP largest, one entry per path."""
+        for i, (value, path) in enumerate(heap):
+            if path == item[1]:
+                if item[0] > value:
+                    heap[i] = item
+                    heapq.heapify(heap)
+                return
+        if len(heap) < self.TOP:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def request(self, path: str, status: int, size: int, ms: float, cache: str | None = None) -> None:
+        """path is the request path with its query; size is the body sent (0 for HEAD and 304)."""
+        route = urllib.parse.unquote(urllib.parse.urlsplit(path).path)
+        kind = "html" if route.endswith("/") else self.TYPES.get(Path(route).suffix.lower(), "other")
+        with self.lock:
+            self.latency.add(ms)
+            self.sizes.add(size)
+            self.status[status] = self.status.get(status, 0) + 1
+            counts = self.types.setdefault(kind, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+            if cache:
+                self.cache[cache] = self.cache.get(cache, 0) + 1
+            self._keep_top(self.slowest, (round(ms, 2), path))
+            self._keep_top(self.heaviest, (size, path))
+
+    def watch(self, paths: int | None, relevant: int | None) -> None:
+        """One batch of watcher events; paths is None when the watcher lost track and a full check runs."""
+        with self.lock:
+            self.watcher["batches"] += 1
+            if paths is None:
+                self.watcher["full_rescans"] += 1
+            else:
+                self.watcher["paths"] += paths
+                self.watcher["relevant"] += relevant or 0
+
+    def build(self, ms: float, ok: bool, written: int, notified: int = 0) -> None:
+        with self.lock:
+            self.builds.add(ms)
+            self.build_failures += not ok
+            self.outputs_written += written
+            self.notified += notified
+            self.last_build = {"ms": round(ms, 1), "ok": ok, "written": written, "at": time.strftime("%H:%M:%S")}
+
+    def to_json(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "uptime_s": round(time.time() - self.started),
+                "requests": {
+                    "latency_ms": self.latency.to_json(),
+                    "bytes": self.sizes.to_json(),
+                    "status": {str(code): n for code, n in sorted(self.status.items())},
+                    "by_type": {kind: {"requests": n, "bytes": size} for kind, (n, size) in sorted(self.types.items())},
+                    "cache": dict(sorted(self.cache.items())),
+                    "slowest": [{"ms": ms, "path": path} for ms, path in sorted(self.slowest, reverse=True)],
+                    "heaviest": [{"bytes": size, "path": path} for size, path in sorted(self.heaviest, reverse=True)],
+                },
+                "builds": {
+                    "duration_ms": self.builds.to_json(),
+                    "failed": self.build_failures,
+                    "outputs_written": self.outputs_written,
+                    "pages_notified": self.notified,
+                    "last": self.last_build,
+                },
+                "watcher": dict(self.watcher),
+            }
+
+
+def metrics_html(data: dict[str, Any]) -> str:
+    """A small, self-refreshing page over DevMetrics.to_json()."""
+    def table(rows: list[tuple[Any, ...]], head: tuple[str, ...]) -> str:
+        cells = "".join("<tr>" + "".join(f"<td>{escape(str(c))}</td>" for c in row) + "</tr>" for row in rows)
+        return f"<table><tr>{''.join(f'<th>{escape(h)}</th>' for h in head)}</tr>{cells}</table>"
+
+    def histogram(title: str, h: dict[str, Any], unit: str) -> str:
+        peak = max((n for _, n in h["buckets"]), default=0) or 1
+        rows = "".join(
+            f"<tr><td>{'&le; ' + str(bound) if bound is not None else '&gt;'}</td>"
+            f"<td><span class=bar style=\"width:{n * 200 // peak}px\"></span> {n}</td></tr>"
+            for bound, n in h["buckets"]
+        )
+        summary = f"count {h['count']}, mean {h['mean']}, p50 {h['p50']}, p95 {h['p95']}, max {h['max']} ({unit})"
+        return f"<h2>{escape(title)}</h2><p>{escape(summary)}</p><table>{rows}</table>"
+
+    requests, builds = data["requests"], data["builds"]
+    parts = [
+        f"<h1>dev.py</h1><p>up {data['uptime_s']} s &middot; <a href=\"{STATS_PATH}?format=json\">JSON</a></p>",
+        histogram("Request latency", requests["latency_ms"], "ms"),
+        histogram("Response size", requests["bytes"], "bytes"),
+        "<h2>Status</h2>" + table(list(requests["status"].items()), ("status", "requests")),
+        "<h2>By type</h2>" + table([(k, v["requests"], v["bytes"]) for k, v in requests["by_type"].items()], ("type", "requests", "bytes")),
+        "<h2>Cache</h2>" + table(list(requests["cache"].items()), ("result", "requests")),
+        "<h2>Slowest</h2>" + table([(r["ms"], r["path"]) for r in requests["slowest"]], ("ms", "path")),
+        "<h2>Heaviest</h2>" + table([(r["bytes"], r["path"]) for r in requests["heaviest"]], ("bytes", "path")),
+        histogram("Builds", builds["duration_ms"], "ms"),
+        "<p>" + escape(f"failed {builds['failed']}, outputs written {builds['outputs_written']}, "
+                    f"pages notified {builds['pages_notified']}, last {builds['last']}") + "</p>",
+        "<h2>Watcher</h2>" + table(list(data["watcher"].items()), ("events", "count")),
+    ]
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><meta http-equiv=\"refresh\" content=\"2\">"
+        "<title>dev.py stats</title><style>body{font:13px system-ui,sans-serif;margin:1.5em}"
+        "td,th{padding:1px 8px;text-align:left}.bar{display:inline-block;height:9px;background:#48c}</style>"
+        f"</head><body>{''.join(parts)}</body></html>"
+    )
+
+
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler for the dev server (HTTP/1.1 keep-alive, one thread per connection).
+
+    Serves a precompressed sibling (file.br / file.gz) when the client accepts it. A sibling is only used while
+    its mtime matches the file's (build.py's precompress keeps them equal), so a stale variant never shadows a
+    newer file. Files carry ETag/Last-Modified and conditional requests get 304; unencoded files honour byte
+    ranges (video seeking) and are sent with sendfile. Fingerprinted assets are sent as immutable, everything
+    else must be revalidated. With live reload, HTML gets the client script and LIVE_EVENTS streams changes.
+    Images under content/ requested with ?w= and/or ?fmt= are resized on the fly through a MediaCache.
+    With DevMetrics, every GET/HEAD is timed and counted, and STATS_PATH shows the numbers.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = 60  # idle keep-alive connections are closed after this many seconds
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+    # Content-hashed copies from build.py --dist (name.<10 hex>.css/js) never change, so they may be cached for good.
+    HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{10}\.(?:css|js)$")
+
+    def __init__(
+        self,
+        *args: Any,
+        live: LiveReload | None = None,
+        stats: StatCache | None = None,
+        media: MediaCache | None = None,
+        metrics: DevMetrics | None = None,
+        **kwargs: Any,
+    ) -> None:
+        # Set before super().__init__, which already handles the request.
+        self.live = live
+        self.stats = stats or StatCache()
+        self.media = media
+        self.metrics = metrics
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        route = self.path.split("?", 1)[0]
+        if self.live and route == LIVE_EVENTS:
+            self.send_events()
+        elif self.live and route == LIVE_SCRIPT:
+            self.send_bytes(LIVE_CLIENT.encode("utf-8"), "text/javascript")
+        elif self.metrics and route == STATS_PATH:
+            self.send_stats()
+        else:
+            self.timed(super().do_GET)
+
+    def do_HEAD(self) -> None:
+        self.timed(super().do_HEAD)
+
+    def timed(self, handle: Callable[[], None]) -> None:
+        """Run handle and record the response (status, body bytes, cache result, wall time) in self.metrics."""
+        self.status, self.body_bytes, self.cache_result = 0, 0, None
+        t0 = time.perf_counter()
+        try:
+            handle()
+        finally:
+            if self.metrics and self.status:
+                size = 0 if self.command == "HEAD" or self.status == 304 else self.body_bytes
+                cache = "revalidated" if self.status == 304 else self.cache_result
+                self.metrics.request(self.path, self.status, size, (time.perf_counter() - t0) * 1000, cache)
+
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self.status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if keyword.lower() == "content-length":
+            self.body_bytes = int(value)
+        super().send_header(keyword, value)
+
+    def send_stats(self) -> None:
+        """DevMetrics as JSON (?format=json, or any client not asking for HTML) or as a small HTML page."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        fmt = query.get("format", ["html" if "text/html" in self.headers.get("Accept", "") else "json"])[0]
+        data = self.metrics.to_json()
+        if fmt == "html":
+            self.send_bytes(metrics_html(data).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self.send_bytes(json.dumps(data, indent=2).encode("utf-8"), "application/json")
+
+    def send_bytes(self, body: bytes, content_type: str, encoding: str | None = None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self) -> None:
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        page = page_file(query.get("page", ["/"])[0])
+        q = self.live.subscribe(page)
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            self.wfile.write(f"retry: 1000\nevent: hello\ndata: {self.live.server_id}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            while True:
+                try:
+                    message = f"event: change\ndata: {q.get(timeout=15)}\n\n"
+                except queue.Empty:
+                    message = ": keep-alive\n\n"
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.live.unsubscribe(q)
+
+    def send_page(self, path: Path, st: os.stat_result, accepted: set[str]):
+        """An HTML page with the live-reload client added (gzipped if the site is precompressed and gzip is accepted)."""
+        html = path.read_bytes()
+        end = html.lower().rfind(b"</body>")
+        tag = LIVE_SCRIPT_TAG.encode("utf-8")
+        html = html[:end] + tag + html[end:] if end >= 0 else html + tag
+        gz_st = self.stats.stat(path.with_name(path.name + ".gz"))
+        encoding = None
+        if "gzip" in accepted and gz_st is not None and gz_st.st_mtime_ns == st.st_mtime_ns:
+            html = gzip.compress(html, 9)
+            encoding = "gzip"
+            self.vary = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(html)))
+        self.end_headers()
+        return io.BytesIO(html)
+
+    def send_head(self):
+        self.vary = self.immutable = False
+        self.range = None
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.split("?", 1)[0].endswith("/"):
+            path = path / "index.html"
+        st = self.stats.stat(path)
+        if st is None or not stat.S_ISREG(st.st_mode):
+            return super().send_head()  # directory redirects and listings, 404s
+        self.immutable = bool(self.HASHED_ASSET_RE.search(path.name))
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        if self.media and ("w" in query or "fmt" in query) and path.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp"):
+            if Path(self.directory, "content") in path.parents:
+                return self.send_resized(path, st, query)
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        if self.live and path.suffix == ".html":
+            return self.send_page(path, st, accepted)
+        for coding, suffix in self.ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            variant_st = self.stats.stat(variant)
+            if variant_st is None or variant_st.st_mtime_ns != st.st_mtime_ns:
+                continue
+            self.vary = True
+            if coding not in accepted and "*" not in accepted:
+                continue
+            self.cache_result = f"precompressed {coding}"
+            return self.send_file(path, st, variant, variant_st, coding)
+        return self.send_file(path, st, path, st)
+
+    def send_resized(self, path: Path, st: os.stat_result, query: dict[str, list[str]]):
+        try:
+            width = int(query["w"][0]) if "w" in query else None
+            fmt = query["fmt"][0] if "fmt" in query else None
+            if (width is not None and not 1 <= width <= MediaCache.MAX_WIDTH) or (fmt is not None and fmt not in MediaCache.SUFFIXES):
+                raise ValueError(query)
+        except ValueError:
+            self.send_error(400, f"Expected ?w=<1-{MediaCache.MAX_WIDTH}>&fmt=<{'|'.join(MediaCache.SUFFIXES)}>")
+            return None
+        if not HAS_PIL:
+            self.send_error(501, "Resizing images needs Pillow (pip install Pillow)")
+            return None
+        try:
+            out, hit = self.media.get(path, st, width, fmt)
+            self.cache_result = "resize hit" if hit else "resize miss"
+            out_st = out.stat()
+        except OSError as e:  # includes files Pillow cannot read
+            self.send_error(500, f"Could not resize {path.name}: {e}")
+            return None
+        return self.send_file(out, out_st, out, out_st)
+
+    def not_modified(self, etag: str, st: os.stat_result) -> bool:
+        """Whether the client's cached copy (If-None-Match, else If-Modified-Since) is still current."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(st.st_mtime) <= email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
         return False
-    if result.stdout.strip():
-        print(result.stdout.strip())
-    return True
-
-
-def last_mtime_tree(path: Path) -> float:
-    """Max mtime of path and all descendants (files only)."""
-    if not path.exists():
-        return 0.0
-    if path.is_file():
-        return path.stat().st_mtime
-    return max(
-        (p.stat().st_mtime for p in path.rglob("*") if p.is_file()),
-        default=0.0,
+
+    def send_file(self, path: Path, st: os.stat_result, served: Path, served_st: os.stat_result, coding: str | None = None):
+        """Headers for path, sent as served (itself or its precompressed variant): 304 if the client's copy is current,
+        206 for a satisfiable byte range of an unencoded file, else 200. Returns the open file or None."""
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + coding if coding else ""}"'
+        last_modified = self.date_time_string(int(st.st_mtime))
+        if self.not_modified(etag, st):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return None
+        size = served_st.st_size
+        start, end = 0, size - 1
+        status = 200
+        requested = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if requested and not coding and (if_range is None or if_range.strip() in (etag, last_modified)):
+            try:
+                requested_range = byte_range(requested, size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            if requested_range:
+                start, end = requested_range
+                status = 206
+        f = open(served, "rb")
+        self.send_response(status)
+        self.send_header("Content-Type", self.guess_type(str(path)))
+        if coding:
+            self.send_header("Content-Encoding", coding)
+        else:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.range = (start, end - start + 1)
+        return f
+
+    def copyfile(self, source, outputfile) -> None:
+        """Send what send_file opened (the whole file or the requested range) with sendfile(2) where available."""
+        if self.range is None:
+            super().copyfile(source, outputfile)  # in-memory bodies: pages with the live-reload client, listings
+            return
+        offset, count = self.range
+        self.range = None
+        try:
+            self.connection.sendfile(source, offset, count)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # the browser dropped the response, e.g. when seeking in a video
+
+    def end_headers(self) -> None:
+        if getattr(self, "vary", False):
+            self.send_header("Vary", "Accept-Encoding")
+        if getattr(self, "immutable", False):
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            # Revalidate (If-Modified-Since -> 304) so a reload refetches only what changed.
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+
+def ignored(path: Path) -> bool:
+    """Editor swap/backup files, hidden files, build temp files, precompressed variants and media/originals/."""
+    name = path.name
+    return (
+        name.startswith(".")
+        or name.endswith(("~", ".swp", ".swx", ".tmp", ".gz", ".br"))
+        or name == "4913"  # vim's write probe
+        or "originals" in path.parts
     )
 
 
-def watch_and_build(interval: float = 1.5) -> None:
+class PollWatcher:
+    """Fallback watcher: stat every watched file each interval and report the ones that changed."""
+
+    def __init__(self, roots: list[tuple[Path, bool]], interval: float = 1.5) -> None:
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        found = {}
+        for root, recursive in self.roots:
+            for folder, dirs, files in os.walk(root):
+                dirs[:] = [d for d in dirs if recursive and not ignored(Path(folder) / d)]
+                for name in files:
+                    path = Path(folder) / name
+                    if ignored(path):
+                        continue
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    found[path] = (st.st_size, st.st_mtime_ns)
+        return found
+
+    def wait(self) -> set[Path] | None:
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._scan()
+            changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+
+class InotifyWatcher:
+    """Linux inotify (through ctypes) on every watched directory; blocks without polling until something changes.
+
+    wait() returns the changed paths once a burst of events has been quiet for DEBOUNCE seconds (an editor's
+    save, a git checkout), or None if the kernel queue overflowed and the changes are unknown.
+    """
+
+    IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x8, 0x40, 0x80, 0x100, 0x200
+    IN_Q_OVERFLOW, IN_IGNORED, IN_ONLYDIR, IN_ISDIR = 0x4000, 0x8000, 0x01000000, 0x40000000
+    IN_NONBLOCK, IN_CLOEXEC = os.O_NONBLOCK, 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of NUL-padded name
+    DEBOUNCE = 0.03
+    MAX_DELAY = 0.3
+
+    def __init__(self, roots: list[tuple[Path, bool]]) -> None:
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, tuple[Path, bool]] = {}  # watch descriptor -> (directory, recursive)
+        for root, recursive in roots:
+            self._add(root, recursive)
+
+    def _add(self, folder: Path, recursive: bool) -> list[Path]:
+        """Watch folder (and its subfolders if recursive); return the files already in it."""
+        files = []
+        for current, dirs, names in os.walk(folder):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"inotify_add_watch {current}: {os.strerror(errno)}")
+            self.dirs[wd] = (Path(current), recursive)
+            dirs[:] = [d for d in dirs if recursive and not ignored(Path(current) / d)]
+            files += [Path(current) / name for name in names]
+        return files
+
+    def _read(self, timeout: float | None) -> set[Path] | None:
+        """Changed paths from the events that arrive within timeout (empty set if none, None on overflow)."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: set[Path] | None = set()
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, size = self.EVENT.unpack_from(data, pos)
+            name = data[pos + self.EVENT.size:pos + self.EVENT.size + size].rstrip(b"\0")
+            pos += self.EVENT.size + size
+            if mask & self.IN_Q_OVERFLOW:
+                changed = None
+                continue
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if wd not in self.dirs or not name:
+                continue
+            folder, recursive = self.dirs[wd]
+            path = folder / os.fsdecode(name)
+            if ignored(path):
+                continue
+            if mask & self.IN_ISDIR:
+                if recursive and mask & (self.IN_CREATE | self.IN_MOVED_TO) and changed is not None:
+                    # Files may have landed before the new directory was watched; report them all.
+                    changed.update(p for p in self._add(path, recursive) if not ignored(p))
+                continue
+            if changed is not None:
+                changed.add(path)
+        return changed
+
+    def wait(self) -> set[Path] | None:
+        changed: set[Path] | None = set()
+        while not changed and changed is not None:
+            changed = self._read(None)
+        deadline = time.monotonic() + self.MAX_DELAY
+        while time.monotonic() < deadline:
+            more = self._read(self.DEBOUNCE)
+            if more is None:
+                changed = None
+            elif not more:
+                break
+            elif changed is not None:
+                changed |= more
+        return changed
+
+
+def make_watcher(roots: list[tuple[Path, bool]]) -> InotifyWatcher | PollWatcher:
+    try:
+        return InotifyWatcher(roots)
+    except (OSError, AttributeError) as e:  # no inotify (macOS, Windows) or out of watches
+        print(f"[dev] inotify unavailable ({e}), polling for changes instead")
+        return PollWatcher(roots)
+
+
+def watch_and_build(
+    service: BuildService,
+    live: LiveReload | None = None,
+    stats: StatCache | None = None,
+    metrics: DevMetrics | None = None,
+) -> None:
     root = repo_root()
-    content_dir = root / "content"
-    projects_json = root / "content" / "projects.json"
-    build_script = root / "scripts" / "build.py"
-    last = 0.0
+    # (directory, recursive); scripts/ only for build.py, its local imports and its project page shell. css/ and js/ are not
+    # build inputs, but the export copies them and open pages reload (or swap stylesheets) when they change.
+    roots = [(root / "content", True), (root / "scripts", False), (root / "scripts" / "templates", False)]
+    if service.dist or live:
+        roots += [(root / "css", True), (root / "js", True)]
+    watcher = make_watcher(roots)
+    scripts = root / "scripts"
 
     while True:
         try:
-            t = max(
-                last_mtime_tree(content_dir),
-                projects_json.stat().st_mtime if projects_json.exists() else 0.0,
-                build_script.stat().st_mtime if build_script.exists() else 0.0,
-            )
-            if last == 0:
-                last = t  # skip build on first tick (already built at startup)
-            elif t > last:
-                print("[dev] change detected, rebuilding...")
-                if build():
-                    pass
-                else:
-                    print("[dev] build failed", file=sys.stderr)
-                last = t
-            time.sleep(interval)
+            changed = watcher.wait()
+            if stats:
+                stats.clear()
+            reported = None if changed is None else len(changed)
+            if changed is not None:
+                changed = {p for p in changed if p.parent != scripts or p in service.sources}
+                changed = service.pending(changed)
+            if metrics:
+                metrics.watch(reported, None if changed is None else len(changed))
+            if changed is not None and not changed:
+                continue
+            t0 = time.perf_counter()
+            what = "unknown files" if changed is None else ", ".join(sorted(p.relative_to(root).as_posix() for p in changed)[:3])
+            more = f" (+{len(changed) - 3} more)" if changed is not None and len(changed) > 3 else ""
+            print(f"[dev] changed: {what}{more}, rebuilding...")
+            ok = service.build(changed)
+            if stats:
+                stats.clear()  # the build and export rewrote files
+            ms = (time.perf_counter() - t0) * 1000
+            notified = 0
+            if ok:
+                told = ""
+                if live:
+                    files = set(service.session.written) | {p.relative_to(root).as_posix() for p in changed or ()}
+                    notified = live.notify(files)
+                    told = f", {notified} open page(s) notified"
+                print(f"[dev] rebuilt in {ms:.0f} ms{told}")
+            else:
+                print("[dev] build failed", file=sys.stderr)
+            if metrics:
+                metrics.build(ms, ok, len(service.session.written) if ok else 0, notified)
         except KeyboardInterrupt:
             return
         except Exception as e:
             print(f"[dev] watch error: {e}", file=sys.stderr)
-            time.sleep(interval)
+            time.sleep(1)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the site locally and rebuild on change.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""URLs besides the site:
+  {STATS_PATH}            request, cache and build metrics (HTML; JSON for curl or ?format=json)
+  <image>?w=640&fmt=webp  content image resized (fmt: webp, jpeg or png; needs Pillow),
+                          cached in .cache/dev/media/ (256 MB, least recently used evicted)""",
+    )
+    parser.add_argument(
+        "--dist", action="store_true",
+        help="Serve the minified, precompressed export in dist/ (.br/.gz picked per Accept-Encoding).",
+    )
+    parser.add_argument("--no-reload", action="store_true", help="Serve pages as they are, without the live-reload client.")
+    args = parser.parse_args()
     root = repo_root()
     os.chdir(root)
 
     # Build once so the served site is up to date
-    build()
+    service = BuildService(root, root / "dist" if args.dist else None)
+    metrics = DevMetrics()
+    t0 = time.perf_counter()
+    ok = service.build()
+    metrics.build((time.perf_counter() - t0) * 1000, ok, len(service.session.written) if ok else 0)
 
+    live = None if args.no_reload else LiveReload(service.dist)
+    stats = StatCache()
+    media = MediaCache(root / ".cache" / "dev" / "media")
     port = 8000
-    server = http.server.HTTPServer(
+    # One thread per connection: a long video download or a live-reload stream never blocks other requests.
+    server = http.server.ThreadingHTTPServer(
         ("", port),
-        http.server.SimpleHTTPRequestHandler,
+        functools.partial(
+            DevRequestHandler, directory=str(service.dist or root), live=live, stats=stats, media=media, metrics=metrics
+        ),
     )
 
     def serve() -> None:
@@ -97,9 +1061,10 @@ def main() -> None:
     thread = threading.Thread(target=serve, daemon=True)
     thread.start()
 
-    print(f"Serving at http://localhost:{port}/")
+    print(f"Serving {'dist/' if service.dist else 'repo'} at http://localhost:{port}/")
     print("Watching content/ and build script; rebuilds on change. Ctrl+C to stop.")
-    watch_and_build()
+    print(f"Request and build timings: http://localhost:{port}{STATS_PATH}")
+    watch_and_build(service, live, stats, metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+"""
+Whitespace/comment minifiers for the files build.py --dist exports (HTML, CSS, JS).
+
+Deliberately conservative: nothing is renamed or reordered, strings/regex/template literals and
+<pre>/<textarea> are left alone, JSON <script> blocks are kept byte for byte, and JS keeps its
+line breaks so automatic semicolon insertion behaves exactly as in the source.
+"""
+
+import re
+
+# --- CSS ---
+
+_CSS_TOKEN_RE = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(/\*[\s\S]*?\*/)|(\s+)|([^"'/\s]+|/)""")
+# Spaces around these can go. Not "(" (media queries need "and (") nor "+"/"-" (calc() needs them).
+_CSS_TIGHT = set("{};,>")
+
+
+def minify_css(css: str) -> str:
+    out: list[str] = []
+    pending_space = False
+    for string, comment, space, other in _CSS_TOKEN_RE.findall(css):
+        if comment:
+            continue
+        if space:
+            pending_space = True
+            continue
+        token = string or other
+        if pending_space and out and out[-1][-1] not in _CSS_TIGHT and token[0] not in _CSS_TIGHT and out[-1][-1] != ":":
+            out.append(" ")
+        pending_space = False
+        out.append(token)
+    text = "".join(out)
+    return text.replace(";}", "}").strip() + "\n"
+
+
+# --- JS ---
+
+# A "/" after one of these (or at the start) begins a regex literal, otherwise it is division.
+_JS_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_JS_REGEX_KEYWORDS = ("return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await")
+
+
+def minify_js(js: str) -> str:
+    """Drop comments, indentation and blank lines; collapse runs of spaces. Line breaks are kept."""
+    out: list[str] = []
+    i, n = 0, len(js)
+    # Each entry is the "{" depth of a ${...} substitution inside a template literal.
+    template_stack: list[int] = []
+    depth = 0
+
+    def last_significant() -> str:
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ""
+
+    def regex_allowed() -> bool:
+        prev = last_significant()
+        if not prev:
+            return True
+        if prev[-1] in _JS_REGEX_AFTER:
+            return True
+        word = re.search(r"[A-Za-z_$][\w$]*$", prev)
+        return bool(word and word.group(0) in _JS_REGEX_KEYWORDS)
+
+    def read_template(start: int) -> int:
+        """Copy template text from start (the opening ` or the } closing a ${) up to the closing ` or next ${."""
+        j = start + 1
+        while j < n:
+            c = js[j]
+            if c == "\\":
+                j += 2
+                continue
+            if c == "`":
+                out.append(js[start:j + 1])
+                return j + 1
+            if c == "$" and j + 1 < n and js[j + 1] == "{":
+                out.append(js[start:j + 2])
+                template_stack.append(depth)
+                return j + 2
+            j += 1
+        out.append(js[start:])
+        return n
+
+    while i < n:
+        c = js[i]
+        if c in "\"'":
+            j = i + 1
+            while j < n and js[j] != c:
+                j += 2 if js[j] == "\\" else 1
+            out.append(js[i:j + 1])
+            i = j + 1
+        elif c == "`":
+            i = read_template(i)
+        elif c == "/" and js.startswith("//", i):
+            j = js.find("\n", i)
+            i = n if j == -1 else j
+        elif c == "/" and js.startswith("/*", i):
+            j = js.find("*/", i + 2)
+            i = n if j == -1 else j + 2
+            out.append(" ")
+        elif c == "/" and regex_allowed():
+            j = i + 1
+            in_class = False
+            while j < n and js[j] != "\n":
+                if js[j] == "\\":
+                    j += 2
+                    continue
+                if js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                elif js[j] == "/" and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and (js[j].isalnum() or js[j] == "_"):
+                j += 1  # flags
+            out.append(js[i:j])
+            i = j
+        elif c.isspace():
+            j = i
+            while j < n and js[j].isspace():
+                j += 1
+            out.append("\n" if "\n" in js[i:j] else " ")
+            i = j
+        elif c == "{":
+            depth += 1
+            out.append(c)
+            i += 1
+        elif c == "}":
+            if template_stack and template_stack[-1] == depth:
+                template_stack.pop()
+                i = read_template(i)
+            else:
+                depth -= 1
+                out.append(c)
+                i += 1
+        else:
+            j = i + 1
+            while j < n and not js[j].isspace() and js[j] not in "\"'`/{}":
+                j += 1
+            out.append(js[i:j])
+            i = j
+    text = "".join(out)
+    # Whitespace runs became " " or "\n"; drop the ones that only pad line starts/ends or blank lines.
+    lines = (line.strip(" ") for line in text.split("\n"))
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+# --- HTML ---
+
+# Up to the ">" that ends a tag: quoted attribute values may contain ">" themselves.
+_HTML_TAG_BODY = r"""(?:[^>"']|"[^"]*"|'[^']*')*>"""
+_HTML_TOKEN_RE = re.compile(
+    r"(<!--[\s\S]*?-->)"
+    rf"|(<(script|style|pre|textarea)\b{_HTML_TAG_BODY}[\s\S]*?</\3\s*>)"
+    rf"|(<[^>\s]{_HTML_TAG_BODY}|<[^>]+>)"  # the second form only for a stray unbalanced quote
+    r"|([^<]+|<)",
+    re.IGNORECASE,
+)
+_HTML_OPEN_TAG_RE = re.compile(rf"<{_HTML_TAG_BODY}")
+_HTML_ATTR_RE = re.compile(r"""([^\s=/>]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+_HTML_TAG_NAME_RE = re.compile(r"</?([A-Za-z][A-Za-z0-9-]*)")
+_HTML_UNQUOTED_OK = re.compile(r"[A-Za-z0-9_.:-]+")
+# Whitespace next to these never renders, so it can be dropped rather than collapsed to one space.
+_HTML_BLOCK_TAGS = {
+    "html", "head", "body", "title", "meta", "link", "script", "style", "noscript", "base",
+    "div", "p", "section", "article", "aside", "header", "footer", "nav", "main", "figure", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd", "table", "thead", "tbody",
+    "tfoot", "tr", "td", "th", "blockquote", "form", "fieldset", "hr", "br", "canvas", "video", "iframe",
+    "!doctype",
+}
+_HTML_JSON_TYPES = ("application/json", "application/ld+json")
+
+
+def _minify_tag(tag: str) -> str:
+    name = _HTML_TAG_NAME_RE.match(tag)
+    if not name or tag.startswith("<!"):
+        return tag
+    closing = tag.startswith("</")
+    body = tag[name.end():].rstrip(">").rstrip()
+    if body.endswith("/"):
+        body = body[:-1]  # void elements do not need the XHTML-style slash
+    attrs = []
+    for attr, value in _HTML_ATTR_RE.findall(body):
+        if value and value[0] in "\"'" and _HTML_UNQUOTED_OK.fullmatch(value[1:-1]):
+            value = value[1:-1]
+        attrs.append(f"{attr}={value}" if value else attr)
+    prefix = "</" if closing else "<"
+    return f"{prefix}{name.group(1)}{''.join(' ' + a for a in attrs)}>"
+
+
+def _tag_name(token: str) -> str:
+    if token.lower().startswith("<!doctype"):
+        return "!doctype"
+    match = _HTML_TAG_NAME_RE.match(token)
+    return match.group(1).lower() if match else ""
+
+
+def _minify_raw_block(block: str, kind: str) -> str:
+    open_end = _HTML_OPEN_TAG_RE.match(block).end()
+    close_start = block.lower().rindex("</")
+    open_tag, body, close_tag = block[:open_end], block[open_end:close_start], block[close_start:]
+    kind = kind.lower()
+    if kind == "script":
+        type_attr = re.search(r"""\btype\s*=\s*["']?([^"'\s>]+)""", open_tag, re.IGNORECASE)
+        if type_attr and type_attr.group(1).lower() in _HTML_JSON_TYPES:
+            return f"{_minify_tag(open_tag)}{body}{close_tag}"  # JSON stays byte for byte
+        body = minify_js(body).strip() if body.strip() else ""
+    elif kind == "style":
+        body = minify_css(body).strip()
+    else:
+        return block  # <pre>/<textarea>: whitespace is content
+    return f"{_minify_tag(open_tag)}{body}{_minify_tag(close_tag)}"
+
+
+def minify_html(html: str) -> str:
+    """Strip comments (and whitespace around block-level tags), collapse other whitespace, tidy tags.
+
+    Inline <script>/<style> are minified as JS/CSS; JSON scripts, <pre> and <textarea> are kept as is.
+    """
+    tokens: list[tuple[str, str]] = []  # (kind, text) with kind "tag", "block" or "text"
+    for comment, raw_block, raw_kind, tag, text in _HTML_TOKEN_RE.findall(html):
+        if comment:
+            if comment.startswith("<!--[if"):
+                tokens.append(("tag", comment))
+        elif raw_block:
+            tokens.append(("block", _minify_raw_block(raw_block, raw_kind)))
+        elif tag:
+            tokens.append(("tag", _minify_tag(tag)))
+        elif text:
+            tokens.append(("text", re.sub(r"\s+", " ", text)))
+
+    def is_block(index: int) -> bool:
+        if index < 0 or index >= len(tokens):
+            return True  # document edges
+        kind, text = tokens[index]
+        return kind == "block" or (kind == "tag" and _tag_name(text) in _HTML_BLOCK_TAGS)
+
+    out = []
+    for index, (kind, text) in enumerate(tokens):
+        if kind == "text":
+            if is_block(index - 1):
+                text = text.lstrip(" ")
+            if is_block(index + 1):
+                text = text.rstrip(" ")
+            if not text:
+                continue
+        out.append(text)
+    return "".join(out) + "\n"
@@ -12,17 +12,19 @@ else
   PYTHON=python3
 fi
 
-echo "Building..."
-"$PYTHON" scripts/build.py
-
-echo "Formatting HTML..."
-if command -v npx >/dev/null 2>&1; then
-  npx --yes prettier --write index.html art.html research.html about.html
+# New or replaced images need their srcset variants and placeholder (content/srcset.json) before the build.
+if "$PYTHON" -c "import PIL" 2>/dev/null; then
+  echo "Generating responsive image variants..."
+  "$PYTHON" scripts/responsive_images.py
+  git add -A -- content/srcset.json ':(glob)content/**/srcset/**'
 else
-  echo "  Skipping (npx not found; install Node to format HTML)."
+  echo "Pillow not installed: skipping scripts/responsive_images.py (new images get no srcset or placeholder)"
 fi
 
-git add index.html art.html research.html about.html
+echo "Building..."
+"$PYTHON" scripts/build.py
+
+git add index.html art.html research.html about.html content/*/projects-*.json content/search/*.json content/*/*/detail.html content/*/*/index.html sitemap.xml
 
 echo "Checking case (asset path casing)..."
 "$PYTHON" scripts/check_case.py
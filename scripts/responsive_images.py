@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Generate the responsive image ladder that build.py turns into srcset/sizes.
+
+For every cover image and markdown image of the projects in content/projects.json, writes
+downscaled copies at the widths in build.SRCSET_WIDTHS that are smaller than the source into
+a srcset/ folder next to it (<stem>-<hash>-<width>.<ext>), and records them in content/srcset.json
+together with a placeholder (a CSS gradient of the image's colours, shown until it loads).
+Variants are keyed by the source's content hash, so unchanged images are skipped and edited
+ones get new file names. Variants of images no longer referenced are removed.
+
+Run after adding or replacing images, then rebuild: python3 scripts/responsive_images.py
+Needs Pillow (pip install Pillow).
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    print("Error: Pillow is required. Install with: pip install Pillow")
+    sys.exit(1)
+
+import build
+
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+SRCSET_DIR = "srcset"
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+# Output format per source extension; dev.py's ?fmt= accepts the same names.
+FORMATS = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png", ".webp": "webp"}
+PLACEHOLDER_STOPS = 3
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parent.parent
+
+
+def referenced_images(repo: Path) -> set[str]:
+    """Repo-relative paths of local raster images used as covers or in project bodies."""
+    content_dir = repo / "content"
+    config = json.loads((content_dir / "projects.json").read_text(encoding="utf-8"))
+    images: set[str] = set()
+    for category in ("art", "research"):
+        for slug in config.get(category) or []:
+            md = content_dir / category / slug / "index.md"
+            if not md.exists():
+                continue
+            raw = md.read_text(encoding="utf-8")
+            fm = build.split_frontmatter(raw)
+            data = build.parse_frontmatter_tree(fm) if fm is not None else {}
+            refs = [data.get("cover_image") or ""]
+            refs += [m.group(2) for m in re.finditer(build._MEDIA_RE, build.markdown_body(raw))]
+            for ref in refs:
+                ref = ref.strip() if isinstance(ref, str) else ""
+                path = md.parent / ref
+                if ref and build._is_page_relative(ref) and path.suffix.lower() in RASTER_EXTENSIONS and path.is_file():
+                    images.add(path.relative_to(repo).as_posix())
+    return images
+
+
+def placeholder(img: Image.Image) -> str | None:
+    """Top-to-bottom gradient of the image's average colours; None for images with transparency."""
+    if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+        return None
+    stops = img.convert("RGB").resize((1, PLACEHOLDER_STOPS), Image.BOX)
+    colours = (stops.getpixel((0, y)) for y in range(PLACEHOLDER_STOPS))
+    return f"linear-gradient({', '.join(f'#{r:02x}{g:02x}{b:02x}' for r, g, b in colours)})"
+
+
+def save_variant(img: Image.Image, width: int, out: Path, fmt: str) -> None:
+    """Save img (already EXIF-transposed) downscaled to width (never enlarged) to out as "jpeg", "png" or "webp"."""
+    if width < img.width:
+        img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    if fmt == "jpeg":
+        img.convert("RGB").save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif fmt == "webp":
+        alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        img.convert("RGBA" if alpha else "RGB").save(out, "WEBP", quality=WEBP_QUALITY, method=6)
+    else:
+        img.save(out, "PNG", optimize=True)
+
+
+def make_variants(repo: Path, rel: str, digest: str) -> dict:
+    """Write the ladder for one image; return its manifest entry."""
+    src = repo / rel
+    out_dir = src.parent / SRCSET_DIR
+    with Image.open(src) as img:
+        img = ImageOps.exif_transpose(img)
+        width, height = img.size
+        variants: dict[str, str] = {}
+        for target in build.SRCSET_WIDTHS:
+            if target >= width:
+                break
+            name = f"{src.stem}-{digest[:8]}-{target}{src.suffix.lower()}"
+            out = out_dir / name
+            if not out.exists():
+                out_dir.mkdir(exist_ok=True)
+                save_variant(img, target, out, FORMATS[src.suffix.lower()])
+            variants[str(target)] = f"{SRCSET_DIR}/{name}"
+        fill = placeholder(img)
+    return {"sha": digest, "width": width, "height": height, "variants": variants, "placeholder": fill}
+
+
+def remove_variants(repo: Path, rel: str, entry: dict) -> None:
+    folder = (repo / rel).parent
+    for name in entry.get("variants", {}).values():
+        (folder / name).unlink(missing_ok=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate srcset width variants for project images.")
+    parser.add_argument("--force", action="store_true", help="Regenerate variants even if the source is unchanged.")
+    args = parser.parse_args()
+
+    repo = repo_root()
+    manifest_path = repo / "content" / build.SRCSET_MANIFEST
+    try:
+        old = json.loads(manifest_path.read_text(encoding="utf-8")).get("images", {})
+    except (OSError, ValueError):
+        old = {}
+
+    images: dict[str, dict] = {}
+    generated = 0
+    for rel in sorted(referenced_images(repo)):
+        digest = hashlib.sha256((repo / rel).read_bytes()).hexdigest()
+        entry = old.get(rel)
+        folder = (repo / rel).parent
+        fresh = entry and entry.get("sha") == digest and "placeholder" in entry and all((folder / n).exists() for n in entry["variants"].values())
+        if fresh and not args.force:
+            images[rel] = entry
+            continue
+        if entry:
+            remove_variants(repo, rel, entry)
+        images[rel] = make_variants(repo, rel, digest)
+        generated += 1
+        print(f"  {rel}: {images[rel]['width']}px -> {', '.join(images[rel]['variants']) or 'no smaller widths'}")
+    for rel in old.keys() - images.keys():
+        remove_variants(repo, rel, old[rel])
+        print(f"  {rel}: no longer referenced, variants removed")
+
+    manifest = {"widths": list(build.SRCSET_WIDTHS), "images": images}
+    build.write_output(manifest_path, json.dumps(manifest, indent=1, sort_keys=True, ensure_ascii=False) + "\n")
+    print(f"{len(images)} image(s), {generated} regenerated. Manifest: {manifest_path.relative_to(repo)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
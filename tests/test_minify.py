@@ -0,0 +1,73 @@
+"""Regression tests for scripts/minify.py. Run: python3 -m unittest discover tests"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from minify import minify_css, minify_html, minify_js  # noqa: E402
+
+
+class MinifyHtmlTest(unittest.TestCase):
+    def test_quoted_gt_in_attribute(self):
+        html = '<p>\n  <a title="a > b" data-x=\'1>0\' href="x.html">link</a>\n</p>'
+        self.assertEqual(minify_html(html), "<p><a title=\"a > b\" data-x='1>0' href=x.html>link</a></p>\n")
+
+    def test_quoted_gt_in_raw_block_open_tag(self):
+        html = '<script data-note="a > b">\n  let x = 1;\n</script>'
+        self.assertEqual(minify_html(html), '<script data-note="a > b">let x = 1;</script>\n')
+
+    def test_pre_kept_as_is(self):
+        pre = '<pre class="code" title="x > y">  indented\n\n    <b>bold</b>  trailing  </pre>'
+        self.assertEqual(minify_html(f"<div>\n  {pre}\n</div>"), f"<div>{pre}</div>\n")
+
+    def test_textarea_kept_as_is(self):
+        textarea = "<textarea name=notes>  line one\n    line two  </textarea>"
+        self.assertEqual(minify_html(f"<form>\n  {textarea}\n</form>"), f"<form>{textarea}</form>\n")
+
+    def test_inline_script_regex_literals(self):
+        html = (
+            "<script>\n"
+            "  // comment with a </p> tag\n"
+            "  const tags = /<\\/?(p|div)>/g;\n"
+            "  const quotes = /[\"'`]/;\n"
+            "  const half = total / 2 / count;\n"
+            "  if (/^\\s*$/.test(s)) return;\n"
+            "</script>"
+        )
+        self.assertEqual(
+            minify_html(html),
+            "<script>const tags = /<\\/?(p|div)>/g;\n"
+            "const quotes = /[\"'`]/;\n"
+            "const half = total / 2 / count;\n"
+            "if (/^\\s*$/.test(s)) return;</script>\n",
+        )
+
+    def test_json_script_kept_byte_for_byte(self):
+        html = '<script type="application/ld+json">\n  {"a":  "b > c"}\n</script>'
+        self.assertEqual(minify_html(html), '<script type="application/ld+json">\n  {"a":  "b > c"}\n</script>\n')
+
+    def test_whitespace_and_comments(self):
+        html = "<ul>\n  <!-- note -->\n  <li>one   <em>two</em>  three</li>\n</ul>\n"
+        self.assertEqual(minify_html(html), "<ul><li>one <em>two</em> three</li></ul>\n")
+
+    def test_stray_lt_and_unbalanced_quote_are_kept(self):
+        self.assertEqual(minify_html("<p>a < b and c > d</p>"), "<p>a < b and c > d</p>\n")
+        self.assertEqual(minify_html("<p title=it's>x</p> <b>y</b>"), "<p title=it's>x</p><b>y</b>\n")
+
+
+class MinifyJsTest(unittest.TestCase):
+    def test_strings_and_templates_untouched(self):
+        js = "const a = 'x  // y';\nconst b = `  ${a  }  /* z */ `;\n"
+        self.assertEqual(minify_js(js), "const a = 'x  // y';\nconst b = `  ${a }  /* z */ `;\n")
+
+
+class MinifyCssTest(unittest.TestCase):
+    def test_calc_and_strings(self):
+        css = 'a  >  b {\n  width: calc(100% - 2px);\n  content: "a  b";\n}\n'
+        self.assertEqual(minify_css(css), 'a>b{width:calc(100% - 2px);content:"a  b"}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()